@@ -4,379 +4,15 @@ DEVFOLIO 2025 SUBMISSION MANIFEST
 Vector + Graph Hybrid Database for Efficient AI Retrieval
 
 This manifest documents all files included in the submission.
+The data itself lives in manifest.json next to this file.
 """
 
-SUBMISSION_MANIFEST = {
-    "metadata": {
-        "title": "Vector + Graph Hybrid Database",
-        "problem": "Devfolio Problem Statement 1",
-        "date": "November 27, 2025",
-        "status": "COMPLETE & TESTED",
-        "qualifier_score": "50/50",
-        "projected_final_score": "94/100"
-    },
-    
-    "core_implementation": {
-        "files": {
-            "hybrid_db_api.py": {
-                "type": "Python",
-                "lines": "500+",
-                "purpose": "FastAPI REST server with 10 endpoints",
-                "includes": [
-                    "Vector search (cosine similarity)",
-                    "Graph traversal (BFS)",
-                    "Hybrid search (weighted scoring)",
-                    "CRUD operations for nodes/edges",
-                    "Statistics and health checks",
-                    "Local JSON persistence"
-                ],
-                "status": "✅ Production Ready"
-            },
-            "hybrid_db_cli.py": {
-                "type": "Python",
-                "lines": "400+",
-                "purpose": "Interactive CLI tool for testing",
-                "includes": [
-                    "Interactive demo mode",
-                    "Performance benchmark mode",
-                    "Hybrid advantage demonstration",
-                    "Formatted output with tabulate",
-                    "Direct API testing"
-                ],
-                "status": "✅ Complete"
-            },
-            "requirements.txt": {
-                "type": "Text",
-                "purpose": "Python package dependencies",
-                "packages": [
-                    "fastapi>=0.100",
-                    "uvicorn>=0.20",
-                    "pydantic>=2.0",
-                    "tabulate>=0.9",
-                    "requests>=2.30"
-                ],
-                "status": "✅ All installed"
-            }
-        }
-    },
-    
-    "documentation": {
-        "files": {
-            "00_START_HERE.md": {
-                "length": "3 pages",
-                "audience": "Everyone",
-                "purpose": "Main entry point - submission overview",
-                "includes": [
-                    "Quick summary of what was built",
-                    "Status and scoring",
-                    "How to get started",
-                    "Key features highlight"
-                ]
-            },
-            "QUICK_START.md": {
-                "length": "3 pages",
-                "audience": "Users/Evaluators",
-                "purpose": "Get system running in 2 minutes",
-                "includes": [
-                    "Installation instructions",
-                    "3-step quick start",
-                    "API testing examples",
-                    "Troubleshooting guide"
-                ]
-            },
-            "API_DOCUMENTATION.md": {
-                "length": "600+ lines",
-                "audience": "Developers",
-                "purpose": "Complete API reference",
-                "includes": [
-                    "Architecture overview",
-                    "All 10 endpoints documented",
-                    "Request/response examples",
-                    "Algorithm explanations",
-                    "Use cases and examples",
-                    "Performance metrics",
-                    "Deployment instructions"
-                ]
-            },
-            "DEVFOLIO_SOLUTION.md": {
-                "length": "400+ lines",
-                "audience": "Judges",
-                "purpose": "Problem statement alignment",
-                "includes": [
-                    "Requirements fulfillment matrix",
-                    "Evaluation criteria mapping",
-                    "Scoring projection",
-                    "Real-world use case demo",
-                    "System architecture",
-                    "Code quality assessment",
-                    "Hybrid search effectiveness proof"
-                ]
-            },
-            "COMPLETE_TEST_REPORT.md": {
-                "length": "300+ lines",
-                "audience": "Judges",
-                "purpose": "All test results and validation",
-                "includes": [
-                    "Test commands and results",
-                    "Expected vs actual output",
-                    "Performance benchmarks",
-                    "Requirements checklist",
-                    "Scoring breakdown",
-                    "All tests: PASS ✅"
-                ]
-            },
-            "SUBMISSION_SUMMARY.md": {
-                "length": "300+ lines",
-                "audience": "Evaluators",
-                "purpose": "Executive summary",
-                "includes": [
-                    "Project overview",
-                    "Test results summary",
-                    "Deliverables checklist",
-                    "Evaluation scoring",
-                    "Use case examples",
-                    "Getting started guide"
-                ]
-            },
-            "README_HYBRID_DB.md": {
-                "length": "Full document",
-                "audience": "Everyone",
-                "purpose": "Complete project overview",
-                "includes": [
-                    "Problem statement details",
-                    "Architecture explanation",
-                    "Quick start guide",
-                    "Features and capabilities",
-                    "Testing and verification",
-                    "Performance analysis",
-                    "Tech stack details"
-                ]
-            },
-            "INDEX.md": {
-                "length": "2 pages",
-                "audience": "Navigators",
-                "purpose": "Navigation guide for all documents",
-                "includes": [
-                    "Document index",
-                    "Quick links by audience",
-                    "Evaluation scoring summary",
-                    "Time estimates",
-                    "Support information"
-                ]
-            }
-        },
-        "total_words": "2000+",
-        "status": "✅ Complete"
-    },
-    
-    "data_storage": {
-        "files": {
-            "rag_local/hybrid_vectors.json": {
-                "type": "JSON",
-                "purpose": "Vector database storage",
-                "contains": [
-                    "768-dimensional embeddings",
-                    "Node metadata",
-                    "Embedding dimension info"
-                ],
-                "status": "✅ Created on first run"
-            },
-            "rag_local/hybrid_graph.json": {
-                "type": "JSON",
-                "purpose": "Graph database storage",
-                "contains": [
-                    "Edge relationships",
-                    "Relationship types",
-                    "Edge weights",
-                    "Node connections"
-                ],
-                "status": "✅ Created on first run"
-            }
-        }
-    },
-    
-    "test_results": {
-        "health_check": "✅ PASS - API operational",
-        "demo_population": "✅ PASS - 5 nodes, 4 edges created",
-        "vector_search": "✅ PASS - Cosine similarity working",
-        "graph_traversal": "✅ PASS - BFS working",
-        "hybrid_search": "✅ PASS - Weighted scoring working",
-        "statistics": "✅ PASS - Correct counts",
-        "performance": "✅ PASS - All <40ms",
-        "stability": "✅ PASS - No crashes",
-        "persistence": "✅ PASS - Data survives restart",
-        "type_safety": "✅ PASS - Pydantic validation",
-        "total_tests": "10/10 PASSING"
-    },
-    
-    "performance_metrics": {
-        "vector_search": {
-            "target": "<40ms",
-            "actual": "~20ms",
-            "status": "✅ PASS"
-        },
-        "graph_traversal": {
-            "target": "<40ms",
-            "actual": "~8ms",
-            "status": "✅ PASS"
-        },
-        "hybrid_search": {
-            "target": "<40ms",
-            "actual": "~30ms",
-            "status": "✅ PASS"
-        },
-        "throughput": {
-            "vector": "50+ ops/sec",
-            "graph": "125+ ops/sec",
-            "hybrid": "33+ ops/sec"
-        }
-    },
-    
-    "evaluation_scoring": {
-        "round_1_qualifier": {
-            "core_functionality": "20/20 ✅",
-            "api_quality": "10/10 ✅",
-            "performance": "10/10 ✅",
-            "hybrid_logic": "10/10 ✅",
-            "total": "50/50 ✅ ADVANCES"
-        },
-        "round_2_projected": {
-            "real_world_demo": "28/30",
-            "hybrid_effectiveness": "24/25",
-            "system_design": "19/20",
-            "code_quality": "14/15",
-            "presentation": "9/10",
-            "estimated_total": "94/100"
-        }
-    },
-    
-    "key_features": [
-        "Vector Search - Semantic similarity via embeddings",
-        "Graph Traversal - Relationship-based navigation",
-        "Hybrid Search - Weighted combination of both",
-        "CRUD Operations - Full node and edge management",
-        "REST API - 10 production-grade endpoints",
-        "Type Safety - Pydantic models throughout",
-        "Documentation - 2000+ words",
-        "Performance - All operations <40ms",
-        "Local Persistence - JSON-based storage",
-        "Interactive CLI - Demo and testing tool"
-    ],
-    
-    "stretch_goals_met": [
-        "✅ Multi-hop reasoning (depth parameter)",
-        "✅ Relationship-weighted search",
-        "✅ Basic schema enforcement (Pydantic)",
-        "✅ Pagination and filtering",
-        "✅ Metadata enrichment",
-        "✅ Typed relationships"
-    ],
-    
-    "getting_started": {
-        "step_1": "python hybrid_db_api.py",
-        "step_2": "python hybrid_db_cli.py demo",
-        "step_3": "http://localhost:8000/docs",
-        "time_to_working": "2 minutes"
-    },
-    
-    "endpoints": [
-        {
-            "method": "GET",
-            "path": "/health",
-            "purpose": "Health check",
-            "status": "✅"
-        },
-        {
-            "method": "POST",
-            "path": "/nodes",
-            "purpose": "Create node",
-            "status": "✅"
-        },
-        {
-            "method": "GET",
-            "path": "/nodes",
-            "purpose": "List nodes",
-            "status": "✅"
-        },
-        {
-            "method": "GET",
-            "path": "/nodes/{id}",
-            "purpose": "Get node",
-            "status": "✅"
-        },
-        {
-            "method": "POST",
-            "path": "/edges",
-            "purpose": "Create relationship",
-            "status": "✅"
-        },
-        {
-            "method": "POST",
-            "path": "/search/vector",
-            "purpose": "Vector search",
-            "status": "✅"
-        },
-        {
-            "method": "GET",
-            "path": "/search/graph",
-            "purpose": "Graph traversal",
-            "status": "✅"
-        },
-        {
-            "method": "POST",
-            "path": "/search/hybrid",
-            "purpose": "Hybrid search ⭐",
-            "status": "✅"
-        },
-        {
-            "method": "GET",
-            "path": "/stats",
-            "purpose": "Statistics",
-            "status": "✅"
-        },
-        {
-            "method": "POST",
-            "path": "/demo/populate",
-            "purpose": "Load demo data",
-            "status": "✅"
-        }
-    ],
-    
-    "code_quality": {
-        "type_hints": "✅ Full Pydantic models",
-        "docstrings": "✅ All functions documented",
-        "comments": "✅ Clear explanations",
-        "error_handling": "✅ Graceful failures",
-        "modularity": "✅ Clean separation",
-        "testing": "✅ CLI tool included",
-        "standards": "✅ FastAPI best practices"
-    },
-    
-    "requirements_met": {
-        "core": [
-            "✅ Vector storage with cosine similarity",
-            "✅ Graph storage with nodes and edges",
-            "✅ Hybrid retrieval combining both",
-            "✅ API endpoints for CRUD",
-            "✅ API endpoints for search",
-            "✅ API endpoints for traversal",
-            "✅ Scoring/ranking mechanism",
-            "✅ Embeddings pipeline",
-            "✅ Local persistence",
-            "✅ Real-time queries"
-        ]
-    },
-    
-    "status": "✅ COMPLETE & READY FOR EVALUATION",
-    
-    "next_steps": [
-        "1. Read: 00_START_HERE.md",
-        "2. Run: python hybrid_db_api.py",
-        "3. Demo: python hybrid_db_cli.py demo",
-        "4. Test: http://localhost:8000/docs",
-        "5. Review: API_DOCUMENTATION.md"
-    ]
-}
+import json
+from pathlib import Path
+
+SUBMISSION_MANIFEST = json.loads(
+    Path(__file__).with_name("manifest.json").read_text(encoding="utf-8")
+)
 
 if __name__ == "__main__":
     print("DEVFOLIO 2025 SUBMISSION MANIFEST")
@@ -5,19 +5,90 @@ and properly configured for running the dual ingestion pipeline.
 
 Run:
     python check_environment.py
+    python check_environment.py --fast      # presence only, skip version lookups
+    python check_environment.py --refresh   # ignore the cached result
+    python check_environment.py --json      # machine-readable results on stdout
 """
 
+import argparse
+import os
 import sys
 import subprocess
 import json
+import mmap
+import shutil
+import site
+import threading
+import time
+from functools import cached_property, lru_cache
+from importlib.util import find_spec
+from concurrent.futures import ThreadPoolExecutor, wait
+from importlib.metadata import version as dist_version, PackageNotFoundError
 from pathlib import Path
-from typing import Tuple, Dict, List
+from typing import Tuple, Dict, List, Optional
+
+
+# (name, description) pairs probed by EnvironmentChecker
+_TOOLS: Tuple[Tuple[str, str], ...] = (
+    ('python', 'Python interpreter'),
+    ('pip', 'Python package manager'),
+    ('git', 'Version control'),
+    ('docker', 'Docker container runtime'),
+    ('ollama', 'Local LLM engine'),
+)
+
+_PACKAGES: Tuple[Tuple[str, str], ...] = (
+    ('lightrag', 'LightRAG framework'),
+    ('chromadb', 'Vector database'),
+    ('neo4j', 'Graph database driver'),
+    ('dotenv', 'Environment configuration'),
+    ('unstructured', 'Document parser'),
+    ('tiktoken', 'Token counter'),
+    ('aiohttp', 'Async HTTP client'),
+    ('pytest', 'Testing framework'),
+    ('pytest_asyncio', 'Async test support'),
+)
+
+_FILES: Tuple[Tuple[str, str], ...] = (
+    ('local_hybrid_rag.py', 'Main ingestion script'),
+    ('etl_pipeline.py', 'ETL/NER pipeline'),
+    ('structured_handler.py', 'Structured data handler'),
+    ('requirements.txt', 'Python dependencies'),
+    ('.env.example', 'Environment template'),
+    ('docker-compose.yml', 'Docker configuration'),
+    ('tests/test_etl_pipeline.py', 'ETL tests'),
+    ('tests/test_structured_handler.py', 'Structured tests'),
+    ('docs/DUAL_INGESTION.md', 'Ingestion documentation'),
+)
+
+_REQUIRED_TOOLS = frozenset({'python', 'pip', 'docker', 'ollama'})
+_CRITICAL_PACKAGES = frozenset({'lightrag', 'chromadb', 'neo4j', 'unstructured', 'pytest'})
+_ESSENTIAL_FILES = frozenset({'local_hybrid_rag.py', 'requirements.txt', 'docker-compose.yml'})
+
+# Results of the last full run, reused while the cache key still matches
+CACHE_FILE = Path.home() / '.cache' / 'life_raga' / 'env_check.json'
+# Cached results older than this are re-checked even if the key matches
+CACHE_TTL_SECONDS = 15 * 60
+
+# Import name -> distribution name, where the two differ
+_DIST_NAMES = {
+    'lightrag': 'lightrag-hku',
+    'dotenv': 'python-dotenv',
+    'pytest_asyncio': 'pytest-asyncio',
+}
+
+
+@lru_cache(maxsize=None)
+def _which(command: str) -> Optional[str]:
+    """Resolve a command on PATH in-process; memoized per command name."""
+    return shutil.which(command)
 
 
 class EnvironmentChecker:
     """Comprehensive environment verification."""
 
-    def __init__(self):
+    def __init__(self, fast: bool = False):
+        self.fast = fast
         self.results = {
             'python': {},
             'system_tools': {},
@@ -28,6 +99,18 @@ class EnvironmentChecker:
         }
         self.issues = []
         self.warnings = []
+        # Warnings from check_services, which are never cached
+        self._service_warnings = []
+        # Checks run concurrently from main(); guards the shared lists above
+        self._lock = threading.Lock()
+
+    def _add_issue(self, message: str):
+        with self._lock:
+            self.issues.append(message)
+
+    def _add_warning(self, message: str):
+        with self._lock:
+            self.warnings.append(message)
 
     def check_python_version(self) -> bool:
         """Check Python version (3.10+ required)."""
@@ -40,33 +123,21 @@ class EnvironmentChecker:
         self.results['python']['status'] = 'OK' if status else 'FAIL'
         
         if not status:
-            self.issues.append(f"Python {version.major}.{version.minor} is too old. Need Python 3.10+")
+            self._add_issue(f"Python {version.major}.{version.minor} is too old. Need Python 3.10+")
         
         return status
 
     def check_command_available(self, command: str) -> bool:
         """Check if a command is available in PATH."""
-        try:
-            result = subprocess.run(
-                ['where', command] if sys.platform == 'win32' else ['which', command],
-                capture_output=True,
-                timeout=5,
-            )
-            return result.returncode == 0
-        except Exception as e:
-            return False
+        return _which(command) is not None
+
+    def _tool_ok(self, name: str) -> bool:
+        """Availability recorded by check_system_tools, without a new lookup."""
+        return self.results['system_tools'].get(name, {}).get('available', False)
 
     def check_system_tools(self) -> Dict[str, bool]:
         """Check for essential system tools."""
-        tools = {
-            'python': 'Python interpreter',
-            'pip': 'Python package manager',
-            'git': 'Version control',
-            'docker': 'Docker container runtime',
-            'ollama': 'Local LLM engine',
-        }
-
-        for tool, desc in tools.items():
+        for tool, desc in _TOOLS:
             available = self.check_command_available(tool)
             self.results['system_tools'][tool] = {
                 'description': desc,
@@ -74,35 +145,34 @@ class EnvironmentChecker:
                 'status': '✓' if available else '✗',
             }
             
-            if not available and tool in ['python', 'pip', 'docker', 'ollama']:
-                self.issues.append(f"Missing: {tool} ({desc})")
+            if not available and tool in _REQUIRED_TOOLS:
+                self._add_issue(f"Missing: {tool} ({desc})")
             elif not available and tool in ['git']:
-                self.warnings.append(f"Missing: {tool} ({desc}) - optional but recommended")
+                self._add_warning(f"Missing: {tool} ({desc}) - optional but recommended")
 
         return {k: v['available'] for k, v in self.results['system_tools'].items()}
 
     def check_python_packages(self) -> Dict[str, bool]:
         """Check for required Python packages."""
-        packages = {
-            'lightrag': 'LightRAG framework',
-            'chromadb': 'Vector database',
-            'neo4j': 'Graph database driver',
-            'dotenv': 'Environment configuration',
-            'unstructured': 'Document parser',
-            'tiktoken': 'Token counter',
-            'aiohttp': 'Async HTTP client',
-            'pytest': 'Testing framework',
-            'pytest_asyncio': 'Async test support',
-        }
+        if self.fast:
+            versions = {}
+        else:
+            names = [package for package, _ in _PACKAGES]
+            with ThreadPoolExecutor(max_workers=len(names)) as ex:
+                versions = dict(zip(names, ex.map(self._get_package_version, names)))
 
-        for package, desc in packages.items():
+        for package, desc in _PACKAGES:
+            # find_spec only consults the import finders; it does not run the
+            # package __init__ (chromadb/unstructured take seconds to import)
             try:
-                __import__(package.replace('_', '-').replace('-', '_'))
-                available = True
-                version = self._get_package_version(package)
-                status_msg = f"v{version}" if version else "installed"
-            except ImportError:
+                available = find_spec(package) is not None
+            except (ImportError, ValueError):
                 available = False
+
+            if available:
+                version = versions.get(package)
+                status_msg = f"v{version}" if version else "installed"
+            else:
                 status_msg = "NOT INSTALLED"
 
             self.results['python_packages'][package] = {
@@ -113,46 +183,58 @@ class EnvironmentChecker:
             }
 
             if not available:
-                critical = package in ['lightrag', 'chromadb', 'neo4j', 'unstructured', 'pytest']
+                critical = package in _CRITICAL_PACKAGES
                 if critical:
-                    self.issues.append(f"Missing package: {package} ({desc})")
+                    self._add_issue(f"Missing package: {package} ({desc})")
                 else:
-                    self.warnings.append(f"Missing package: {package} ({desc}) - optional")
+                    self._add_warning(f"Missing package: {package} ({desc}) - optional")
 
         return {k: v['available'] for k, v in self.results['python_packages'].items()}
 
-    def _get_package_version(self, package: str) -> str:
-        """Get installed package version."""
+    def _get_package_version(self, package: str) -> Optional[str]:
+        """Get installed package version from its dist-info metadata."""
+        try:
+            return dist_version(_DIST_NAMES.get(package, package))
+        except PackageNotFoundError:
+            return None
+
+    @cached_property
+    def _docker_containers(self) -> set:
+        """Names of running containers, from a single `docker ps` call.
+
+        Every container-hosted service check is answered from this set, so
+        adding services does not add Docker CLI round-trips. Empty when Docker
+        is missing or the daemon is down.
+        """
         try:
             result = subprocess.run(
-                [sys.executable, '-m', 'pip', 'show', package],
+                ['docker', 'ps', '--format', '{{.Names}}'],
                 capture_output=True,
                 text=True,
-                timeout=10,
+                timeout=5,
             )
-            for line in result.stdout.split('\n'):
-                if line.startswith('Version:'):
-                    return line.split(':')[1].strip()
-        except:
-            pass
-        return None
+        except Exception:
+            return set()
+        if result.returncode != 0:
+            return set()
+        return {line.strip() for line in result.stdout.splitlines() if line.strip()}
 
     def check_services(self) -> Dict[str, bool]:
         """Check for running services (Neo4j, Ollama)."""
         services = {}
 
-        # Check Neo4j
+        # Start the Ollama probe first so its wait overlaps the docker ps call
         try:
-            result = subprocess.run(
-                ['docker', 'ps', '--format', 'json'],
-                capture_output=True,
-                text=True,
-                timeout=5,
+            ollama_proc = subprocess.Popen(
+                ['ollama', 'list'],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
             )
-            containers = json.loads(result.stdout) if result.stdout else []
-            neo4j_running = any('neo4j' in c.get('Names', '').lower() for c in containers)
-        except:
-            neo4j_running = False
+        except OSError:
+            ollama_proc = None
+
+        # Check Neo4j
+        neo4j_running = any('neo4j' in name.lower() for name in self._docker_containers)
 
         services['neo4j'] = {
             'description': 'Neo4j Graph Database',
@@ -162,16 +244,13 @@ class EnvironmentChecker:
         }
 
         # Check Ollama
-        try:
-            result = subprocess.run(
-                ['ollama', 'list'],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            ollama_running = result.returncode == 0
-        except:
-            ollama_running = False
+        ollama_running = False
+        if ollama_proc is not None:
+            try:
+                ollama_running = ollama_proc.wait(timeout=5) == 0
+            except subprocess.TimeoutExpired:
+                ollama_proc.kill()
+                ollama_proc.wait()
 
         services['ollama'] = {
             'description': 'Ollama LLM Service',
@@ -182,39 +261,40 @@ class EnvironmentChecker:
 
         self.results['services'] = services
 
+        service_warnings = []
         if not neo4j_running:
-            self.warnings.append("Neo4j is not running. Start with: docker compose up -d")
+            service_warnings.append("Neo4j is not running. Start with: docker compose up -d")
         if not ollama_running:
-            self.warnings.append("Ollama is not running. Start with: ollama serve")
+            service_warnings.append("Ollama is not running. Start with: ollama serve")
+        for message in service_warnings:
+            self._add_warning(message)
+        self._service_warnings.extend(service_warnings)
 
         return {k: v['running'] for k, v in services.items()}
 
     def check_project_files(self) -> Dict[str, bool]:
         """Check for essential project files."""
-        files = {
-            'local_hybrid_rag.py': 'Main ingestion script',
-            'etl_pipeline.py': 'ETL/NER pipeline',
-            'structured_handler.py': 'Structured data handler',
-            'requirements.txt': 'Python dependencies',
-            '.env.example': 'Environment template',
-            'docker-compose.yml': 'Docker configuration',
-            'tests/test_etl_pipeline.py': 'ETL tests',
-            'tests/test_structured_handler.py': 'Structured tests',
-            'docs/DUAL_INGESTION.md': 'Ingestion documentation',
-        }
-
+        # One directory read per distinct parent instead of a stat() per file
         root = Path(__file__).parent
-        for file, desc in files.items():
-            path = root / file
-            exists = path.exists()
+        present = set()
+        for parent in {f.rpartition('/')[0] for f, _ in _FILES}:
+            prefix = f"{parent}/" if parent else ''
+            try:
+                with os.scandir(root / parent) as entries:
+                    present.update(prefix + entry.name for entry in entries)
+            except OSError:
+                continue
+
+        for file, desc in _FILES:
+            exists = file in present
             self.results['files'][file] = {
                 'description': desc,
                 'exists': exists,
                 'status': '✓' if exists else '✗',
             }
 
-            if not exists and file in ['local_hybrid_rag.py', 'requirements.txt', 'docker-compose.yml']:
-                self.issues.append(f"Missing file: {file}")
+            if not exists and file in _ESSENTIAL_FILES:
+                self._add_issue(f"Missing file: {file}")
 
         return {k: v['exists'] for k, v in self.results['files'].items()}
 
@@ -232,127 +312,228 @@ class EnvironmentChecker:
         }
 
         if not env_exists:
-            self.warnings.append("No .env file found. Copy from .env.example and update credentials.")
+            self._add_warning("No .env file found. Copy from .env.example and update credentials.")
 
         # Check .env content if exists
         if env_exists:
             try:
-                with open(env_file) as f:
-                    content = f.read()
-                    has_neo4j = 'NEO4J_URI' in content
-                    has_ollama = 'LLM_MODEL_NAME' in content
+                # Scan the raw bytes; mmap refuses zero-length files
+                with open(env_file, 'rb') as f:
+                    if os.fstat(f.fileno()).st_size == 0:
+                        has_neo4j = has_ollama = False
+                    else:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            has_neo4j = mm.find(b'NEO4J_URI') != -1
+                            has_ollama = mm.find(b'LLM_MODEL_NAME') != -1
                     env_items['env_content'] = {
                         'has_neo4j_config': has_neo4j,
                         'has_ollama_config': has_ollama,
                         'status': '✓' if (has_neo4j and has_ollama) else '⚠ Incomplete config',
                     }
             except Exception as e:
-                self.warnings.append(f"Could not read .env file: {e}")
+                self._add_warning(f"Could not read .env file: {e}")
 
         self.results['environment'] = env_items
         return env_items
 
+    def cache_key(self) -> str:
+        """Fingerprint of the inputs the check results depend on."""
+        root = Path(__file__).parent
+        parts = [sys.version, sys.executable, str(self.fast)]
+        # Installing or removing a package adds or deletes an entry in a
+        # site-packages directory, which changes that directory's mtime
+        site_dirs = list(getattr(site, 'getsitepackages', list)())
+        site_dirs.append(site.getusersitepackages())
+        for path in (sys.executable, root / 'requirements.txt', root / '.env', *site_dirs):
+            try:
+                parts.append(str(os.path.getmtime(path)))
+            except OSError:
+                parts.append('-')
+        parts.extend(str(_which(tool)) for tool in ('docker', 'ollama'))
+        return '|'.join(parts)
+
+    def load_cache(self, cache_file: Path = CACHE_FILE) -> bool:
+        """Restore results from a previous run if its cache key matches and it is fresh.
+
+        Services are not part of the cache; run check_services() after a hit.
+        """
+        try:
+            cached = json.loads(cache_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return False
+        if cached.get('key') != self.cache_key():
+            return False
+        if not 0 <= time.time() - cached.get('saved_at', 0) <= CACHE_TTL_SECONDS:
+            return False
+        self.results.update(cached['results'])
+        self.issues = cached['issues']
+        self.warnings = cached['warnings']
+        return True
+
+    def save_cache(self, cache_file: Path = CACHE_FILE):
+        """Persist results so the next run can skip probing.
+
+        Service probes are left out, since services start and stop between
+        runs, and a run with issues is not cached at all (any older cache is
+        removed), so the next run checks again once they are fixed.
+        """
+        if self.issues:
+            try:
+                cache_file.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return
+        payload = {
+            'key': self.cache_key(),
+            'saved_at': time.time(),
+            'results': {k: v for k, v in self.results.items() if k != 'services'},
+            'issues': self.issues,
+            'warnings': [w for w in self.warnings if w not in self._service_warnings],
+        }
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(json.dumps(payload, ensure_ascii=False), encoding='utf-8')
+        except OSError:
+            pass
+
+    def run_checks(self):
+        """Run all checks; each one is I/O bound and writes its own results key."""
+        checks = [
+            self.check_python_version,
+            self.check_system_tools,
+            self.check_python_packages,
+            self.check_services,
+            self.check_project_files,
+            self.check_environment_config,
+        ]
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            futures = [ex.submit(check) for check in checks]
+            wait(futures)
+        for future in futures:
+            future.result()
+
+    def exit_code(self) -> int:
+        """0 when everything passed, 1 with warnings only, 2 with critical issues."""
+        if self.issues:
+            return 2
+        return 1 if self.warnings else 0
+
+    def to_json(self) -> str:
+        """Results plus issues/warnings, in the same shape as the cache file."""
+        return json.dumps(
+            {'results': self.results, 'issues': self.issues, 'warnings': self.warnings},
+            indent=2,
+            ensure_ascii=False,
+        )
+
     def print_report(self):
         """Print formatted environment check report."""
-        print("\n" + "="*80)
-        print("LOCAL HYBRID RAG - ENVIRONMENT CHECK REPORT")
-        print("="*80)
+        # Collected and written once rather than one print() per line
+        out: List[str] = []
+        out.append("\n" + "="*80)
+        out.append("LOCAL HYBRID RAG - ENVIRONMENT CHECK REPORT")
+        out.append("="*80)
 
         # Python Version
-        print("\n[PYTHON VERSION]")
+        out.append("\n[PYTHON VERSION]")
         py_info = self.results['python']
-        print(f"  Current:  {py_info['version']}")
-        print(f"  Required: {py_info['required']}")
-        print(f"  Status:   {py_info['status']}")
+        out.append(f"  Current:  {py_info['version']}")
+        out.append(f"  Required: {py_info['required']}")
+        out.append(f"  Status:   {py_info['status']}")
 
         # System Tools
-        print("\n[SYSTEM TOOLS]")
+        out.append("\n[SYSTEM TOOLS]")
         for tool, info in self.results['system_tools'].items():
             symbol = "[OK]" if info['available'] else "[X]"
-            print(f"  {symbol} {tool:12} - {info['description']}")
+            out.append(f"  {symbol} {tool:12} - {info['description']}")
 
         # Python Packages
-        print("\n[PYTHON PACKAGES]")
+        out.append("\n[PYTHON PACKAGES]")
         for pkg, info in self.results['python_packages'].items():
             symbol = info['status']
-            print(f"  {symbol} {pkg:20} - {info['description']:30} {info['info']}")
+            out.append(f"  {symbol} {pkg:20} - {info['description']:30} {info['info']}")
 
         # Services
-        print("\n[SERVICES]")
+        out.append("\n[SERVICES]")
         for service, info in self.results['services'].items():
             status = info['status']
-            print(f"  {status:20} - {info['description']}")
+            out.append(f"  {status:20} - {info['description']}")
             if not info['running']:
-                print(f"     Start: {info['start_cmd']}")
+                out.append(f"     Start: {info['start_cmd']}")
 
         # Project Files
-        print("\n[PROJECT FILES]")
-        essential = ['local_hybrid_rag.py', 'requirements.txt', 'docker-compose.yml']
+        out.append("\n[PROJECT FILES]")
         for file, info in self.results['files'].items():
             symbol = info['status']
-            indicator = "[ESSENTIAL]" if file in essential else "[optional]"
-            print(f"  {symbol} {file:40} {indicator}")
+            indicator = "[ESSENTIAL]" if file in _ESSENTIAL_FILES else "[optional]"
+            out.append(f"  {symbol} {file:40} {indicator}")
 
         # Environment Config
-        print("\n[ENVIRONMENT CONFIG]")
+        out.append("\n[ENVIRONMENT CONFIG]")
         for key, info in self.results['environment'].items():
             if key == 'env_file':
                 symbol = info['status'].split()[0]
-                print(f"  {symbol} {info['description']}")
+                out.append(f"  {symbol} {info['description']}")
             elif key == 'env_content':
-                print(f"  NEO4J Config:   {'[OK]' if info.get('has_neo4j_config') else '[X]'}")
-                print(f"  Ollama Config:  {'[OK]' if info.get('has_ollama_config') else '[X]'}")
+                out.append(f"  NEO4J Config:   {'[OK]' if info.get('has_neo4j_config') else '[X]'}")
+                out.append(f"  Ollama Config:  {'[OK]' if info.get('has_ollama_config') else '[X]'}")
 
         # Issues and Warnings
         if self.issues or self.warnings:
-            print("\n" + "="*80)
-            print("ISSUES & WARNINGS")
-            print("="*80)
+            out.append("\n" + "="*80)
+            out.append("ISSUES & WARNINGS")
+            out.append("="*80)
 
             if self.issues:
-                print("\n[CRITICAL ISSUES - MUST FIX]:")
+                out.append("\n[CRITICAL ISSUES - MUST FIX]:")
                 for i, issue in enumerate(self.issues, 1):
-                    print(f"  {i}. {issue}")
+                    out.append(f"  {i}. {issue}")
 
             if self.warnings:
-                print("\n[WARNINGS - Recommended to fix]:")
+                out.append("\n[WARNINGS - Recommended to fix]:")
                 for i, warning in enumerate(self.warnings, 1):
-                    print(f"  {i}. {warning}")
+                    out.append(f"  {i}. {warning}")
 
         # Summary
-        print("\n" + "="*80)
-        print("SUMMARY")
-        print("="*80)
+        out.append("\n" + "="*80)
+        out.append("SUMMARY")
+        out.append("="*80)
 
         all_critical_ok = len(self.issues) == 0
         all_recommended_ok = len(self.warnings) == 0
 
+        if self.fast:
+            out.append("\n(--fast: package versions were not resolved)")
+
         if all_critical_ok and all_recommended_ok:
-            print("\n[SUCCESS] ALL CHECKS PASSED! System is ready for ingestion.")
-            print("\nNext steps:")
-            print("  1. Ensure Neo4j is running: docker compose up -d")
-            print("  2. Ensure Ollama is running with models pulled")
-            print("  3. Run: python local_hybrid_rag.py")
-            print("  4. Or run tests: pytest tests/ -v")
-            return 0
+            out.append("\n[SUCCESS] ALL CHECKS PASSED! System is ready for ingestion.")
+            out.append("\nNext steps:")
+            out.append("  1. Ensure Neo4j is running: docker compose up -d")
+            out.append("  2. Ensure Ollama is running with models pulled")
+            out.append("  3. Run: python local_hybrid_rag.py")
+            out.append("  4. Or run tests: pytest tests/ -v")
+            exit_code = 0
 
         elif all_critical_ok:
-            print("\n[WARNING] WARNINGS PRESENT - System may work but has missing optional components.")
-            print("\nYou can proceed, but consider fixing the warnings above.")
-            print("\nTo run injection:")
-            print("  1. Make sure services are running (Neo4j, Ollama)")
-            print("  2. Run: python local_hybrid_rag.py")
-            return 1
+            out.append("\n[WARNING] WARNINGS PRESENT - System may work but has missing optional components.")
+            out.append("\nYou can proceed, but consider fixing the warnings above.")
+            out.append("\nTo run injection:")
+            out.append("  1. Make sure services are running (Neo4j, Ollama)")
+            out.append("  2. Run: python local_hybrid_rag.py")
+            exit_code = 1
 
         else:
-            print("\n[ERROR] CRITICAL ISSUES FOUND - System is NOT ready for ingestion.")
-            print("\nPlease fix the issues above before proceeding.")
-            print("\nTo install missing packages:")
-            print("  pip install -r requirements.txt")
-            print("\nTo start services:")
-            print("  docker compose up -d")
-            print("  ollama serve")
-            return 2
+            out.append("\n[ERROR] CRITICAL ISSUES FOUND - System is NOT ready for ingestion.")
+            out.append("\nPlease fix the issues above before proceeding.")
+            out.append("\nTo install missing packages:")
+            out.append("  pip install -r requirements.txt")
+            out.append("\nTo start services:")
+            out.append("  docker compose up -d")
+            out.append("  ollama serve")
+            exit_code = 2
+
+        sys.stdout.write("\n".join(out) + "\n")
+        return exit_code
 
     def get_installation_commands(self) -> List[str]:
         """Get commands to install missing dependencies."""
@@ -379,16 +560,16 @@ class EnvironmentChecker:
         print("INSTALLATION GUIDE")
         print("="*80)
 
-        if self.check_command_available('python') and not self.check_command_available('pip'):
+        if self._tool_ok('python') and not self._tool_ok('pip'):
             print("\n📌 PYTHON PIP NOT FOUND")
             print("  Fix: python -m ensurepip --upgrade")
 
-        if not self.check_command_available('docker'):
+        if not self._tool_ok('docker'):
             print("\n🐳 DOCKER NOT INSTALLED")
             print("  Download: https://www.docker.com/products/docker-desktop")
             print("  Or: choco install docker-desktop (if using Chocolatey)")
 
-        if not self.check_command_available('ollama'):
+        if not self._tool_ok('ollama'):
             print("\n🦙 OLLAMA NOT INSTALLED")
             print("  Download: https://ollama.com")
             print("  Or: choco install ollama (if using Chocolatey)")
@@ -403,15 +584,27 @@ class EnvironmentChecker:
 
 def main():
     """Run environment check."""
-    checker = EnvironmentChecker()
-
-    # Run all checks
-    checker.check_python_version()
-    checker.check_system_tools()
-    checker.check_python_packages()
-    checker.check_services()
-    checker.check_project_files()
-    checker.check_environment_config()
+    parser = argparse.ArgumentParser(description="Check the Local Hybrid RAG environment")
+    parser.add_argument("--fast", "--no-versions", dest="fast", action="store_true",
+                        help="Only check package presence, skip version lookups")
+    parser.add_argument("--refresh", action="store_true",
+                        help=f"Ignore cached results in {CACHE_FILE}")
+    parser.add_argument("--json", action="store_true",
+                        help="Write results as JSON to stdout instead of the report")
+    args = parser.parse_args()
+
+    checker = EnvironmentChecker(fast=args.fast)
+
+    if args.refresh or not checker.load_cache():
+        checker.run_checks()
+        checker.save_cache()
+    else:
+        # Services are always probed live
+        checker.check_services()
+
+    if args.json:
+        sys.stdout.write(checker.to_json() + "\n")
+        return checker.exit_code()
 
     # Print report
     exit_code = checker.print_report()
@@ -12,16 +12,47 @@ Pipeline flow:
     Raw text -> Chunking -> Embeddings -> Vector storage
 """
 
+import bisect
+import copy
+import hashlib
+import os
 import re
 import asyncio
-from typing import List, Dict, Tuple, Optional, Any
-from dataclasses import dataclass, asdict
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Iterator, Literal, Tuple, Optional, Any
+from dataclasses import dataclass
+from functools import cached_property
 import logging
 
+import numpy as np
+
+try:
+    import hyperscan
+except ImportError:  # optional: falls back to scanning every regex
+    hyperscan = None
+
 logger = logging.getLogger(__name__)
 
+# Compiled Hyperscan databases, shared by all extractors with the same patterns
+_PREFILTER_DBS: Dict[tuple, Any] = {}
+TRANSFORMER_NER_MODEL = "dslim/bert-base-multilingual-cased-ner"
+SPACY_NER_MODEL = "en_core_web_sm"
+# Loaded HuggingFace pipelines by model name, shared by all ETL pipelines
+_MODEL_CACHE: Dict[str, Any] = {}
+# CoNLL labels produced by the transformer model -> our entity types
+_TRANSFORMER_LABELS = {'PER': 'PERSON', 'ORG': 'ORG', 'LOC': 'LOC', 'MISC': 'MISC'}
+
+# process_unstructured_text results keyed by (text digest, chunk_size,
+# document_id, backend); oldest entries are evicted first
+_RESULT_CACHE: Dict[Tuple[str, int, str, str], Dict[str, Any]] = {}
+_RESULT_CACHE_SIZE = 256
+
+# Hyperscan scratch space must not be shared between concurrent scans
+_scratch_local = threading.local()
+
 
-@dataclass
+@dataclass(slots=True)
 class Entity:
     """Represents a named entity extracted from text."""
     name: str
@@ -30,8 +61,18 @@ class Entity:
     end_char: int
     confidence: float = 1.0
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict of the entity's fields."""
+        return {
+            'name': self.name,
+            'entity_type': self.entity_type,
+            'start_char': self.start_char,
+            'end_char': self.end_char,
+            'confidence': self.confidence,
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class Relation:
     """Represents a relation between two entities."""
     head_entity: str
@@ -39,14 +80,37 @@ class Relation:
     tail_entity: str
     confidence: float = 1.0
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict of the relation's fields."""
+        return {
+            'head_entity': self.head_entity,
+            'relation_type': self.relation_type,
+            'tail_entity': self.tail_entity,
+            'confidence': self.confidence,
+        }
 
-@dataclass
+
+@dataclass(slots=True)
 class GraphTriple:
     """Graph triple (subject, predicate, object) for Neo4j storage."""
     subject: str
     predicate: str
     obj: str
-    metadata: Dict[str, Any] = None
+    metadata: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Dict of fields; metadata is copied one level deep (it is flat)."""
+        return {
+            'subject': self.subject,
+            'predicate': self.predicate,
+            'obj': self.obj,
+            'metadata': dict(self.metadata) if self.metadata is not None else None,
+        }
+
+
+def clear_etl_cache():
+    """Forget all cached process_unstructured_text results."""
+    _RESULT_CACHE.clear()
 
 
 class SimpleNERExtractor:
@@ -57,34 +121,164 @@ class SimpleNERExtractor:
     """
 
     def __init__(self):
-        # Patterns for common entity types
-        self.patterns = {
-            'PERSON': r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b',
-            'ORG': r'\b([A-Z][a-z]+(?:\s+(?:Corp|Inc|LLC|Ltd|Co|Company|Corporation|Group|Inc\.|Ltd\.|Co\.))(?:\b|(?=\s)))',
+        # Patterns for common entity types, compiled once per extractor.
+        # Listed most specific first: when matches overlap, the earlier
+        # type wins (so "Acme Corp" is an ORG, not also a PERSON).
+        raw_patterns = {
             'EMAIL': r'\b([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})\b',
             'URL': r'https?://(?:www\.)?[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}(?:/[^\s]*)?',
+            'ORG': r'\b([A-Z][a-z]+(?:\s+(?:Corp|Inc|LLC|Ltd|Co|Company|Corporation|Group|Inc\.|Ltd\.|Co\.))(?:\b|(?=\s)))',
             'PRODUCT': r'\b([A-Z][a-zA-Z0-9]+(?:\s+[A-Z][a-zA-Z0-9]+)*)\s+(?:v|version)\s*\d+',
+            'PERSON': r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b',
         }
+        self.patterns = {
+            entity_type: re.compile(pattern) for entity_type, pattern in raw_patterns.items()
+        }
+        self._entity_types = list(raw_patterns)
+        # Catch-all types: matched on their own after the specific ones, since
+        # in one alternation they would win any match that starts earlier
+        # (e.g. "The Acme Corp" as one PERSON, losing the ORG)
+        self._fallback_types = ('PERSON',)
+        self._combined: Dict[Tuple[str, ...], re.Pattern] = {}
+        # Literals every match must contain; if absent the regex can be skipped
+        self.prefilters = {'EMAIL': '@', 'URL': '://'}
+        self._prefilter_db = self._compile_prefilter(raw_patterns)
+
+    def _compile_prefilter(self, raw_patterns: Dict[str, str]):
+        """Compile all patterns into one Hyperscan database, if available.
+
+        The database is only used to find which entity types occur at all in a
+        single DFA pass; spans and capture groups still come from `re`, so the
+        extracted entities are identical with or without Hyperscan.
+        PREFILTER mode accepts the lookarounds Hyperscan can't run natively by
+        matching a superset, which is all a prefilter needs.
+        """
+        if hyperscan is None:
+            return None
+        key = tuple(raw_patterns.items())
+        if key in _PREFILTER_DBS:
+            return _PREFILTER_DBS[key]
+        flags = (
+            hyperscan.HS_FLAG_PREFILTER
+            | hyperscan.HS_FLAG_SINGLEMATCH
+            | hyperscan.HS_FLAG_UTF8
+            | hyperscan.HS_FLAG_UCP
+        )
+        try:
+            db = hyperscan.Database()
+            db.compile(
+                expressions=[p.encode('utf-8') for p in raw_patterns.values()],
+                ids=list(range(len(raw_patterns))),
+                elements=len(raw_patterns),
+                flags=[flags] * len(raw_patterns),
+            )
+        except Exception as e:
+            logger.warning("Hyperscan prefilter unavailable (%s), scanning all patterns", e)
+            db = None
+        _PREFILTER_DBS[key] = db
+        return db
+
+    def _candidate_types(self, text: str) -> Optional[set]:
+        """Entity types that may match `text`, or None to scan them all."""
+        if self._prefilter_db is None:
+            return None
+        found = set()
+
+        def on_match(pattern_id, start, end, flags, context):
+            found.add(self._entity_types[pattern_id])
+
+        try:
+            scratches = _scratch_local.__dict__.setdefault('scratches', {})
+            scratch = scratches.get(id(self._prefilter_db))
+            if scratch is None:
+                scratch = scratches[id(self._prefilter_db)] = hyperscan.Scratch(self._prefilter_db)
+            self._prefilter_db.scan(
+                text.encode('utf-8'), match_event_handler=on_match, scratch=scratch
+            )
+        except Exception:
+            return None
+        return found
+
+    def _combined_pattern(self, entity_types: Tuple[str, ...]) -> re.Pattern:
+        """One alternation regex over `entity_types`, compiled once per subset.
+
+        Each type is wrapped in a named group, so a single finditer pass finds
+        all of them and `match.lastgroup` tells which type matched.
+        """
+        combined = self._combined.get(entity_types)
+        if combined is None:
+            combined = self._combined[entity_types] = re.compile('|'.join(
+                f'(?P<{t}>{self.patterns[t].pattern})' for t in entity_types
+            ))
+        return combined
 
     def extract_entities(self, text: str) -> List[Entity]:
-        """Extract entities from text using regex patterns."""
+        """Extract entities from text using regex patterns.
+
+        The specific types are matched in one pass, where the type listed
+        first in the patterns dict wins at a given position. Fallback types
+        (PERSON) run afterwards and only keep spans that overlap nothing
+        already accepted, so matches never overlap.
+        """
+        candidates = self._candidate_types(text)
+        entity_types = tuple(
+            t for t in self._entity_types
+            if (candidates is None or t in candidates)
+            and (t not in self.prefilters or self.prefilters[t] in text)
+        )
+        if not entity_types:
+            return []
+
+        specific_types = tuple(t for t in entity_types if t not in self._fallback_types)
         entities = []
-        seen_spans = set()
-
-        for entity_type, pattern in self.patterns.items():
-            for match in re.finditer(pattern, text):
-                span = (match.start(), match.end())
-                if span not in seen_spans:
-                    entities.append(
-                        Entity(
-                            name=match.group(1) if match.groups() else match.group(0),
-                            entity_type=entity_type,
-                            start_char=match.start(),
-                            end_char=match.end(),
-                            confidence=0.8,
-                        )
+        # Accepted spans never overlap, so their starts and ends are sorted
+        # together and an overlap test is a bisect plus two neighbour checks
+        span_starts: List[int] = []
+        span_ends: List[int] = []
+
+        if specific_types:
+            combined = self._combined_pattern(specific_types)
+            group_index = combined.groupindex
+            for match in combined.finditer(text):
+                entity_type = match.lastgroup
+                group = group_index[entity_type]
+                # The type's own first capture group directly follows its wrapper
+                if self.patterns[entity_type].groups:
+                    group += 1
+                start, end = match.span()
+                span_starts.append(start)
+                span_ends.append(end)
+                entities.append(
+                    Entity(
+                        name=match.group(group),
+                        entity_type=entity_type,
+                        start_char=start,
+                        end_char=end,
+                        confidence=0.8,
                     )
-                    seen_spans.add(span)
+                )
+
+        for entity_type in entity_types:
+            if entity_type not in self._fallback_types:
+                continue
+            pattern = self.patterns[entity_type]
+            for match in pattern.finditer(text):
+                start, end = match.span()
+                i = bisect.bisect_right(span_starts, start)
+                if (i > 0 and span_ends[i - 1] > start) or \
+                   (i < len(span_starts) and span_starts[i] < end):
+                    continue
+                span_starts.insert(i, start)
+                span_ends.insert(i, end)
+                entities.append(
+                    Entity(
+                        name=match.group(1) if match.groups() else match.group(0),
+                        entity_type=entity_type,
+                        start_char=start,
+                        end_char=end,
+                        confidence=0.8,
+                    )
+                )
 
         return sorted(entities, key=lambda e: e.start_char)
 
@@ -93,7 +287,7 @@ class RelationExtractor:
     """Extract relations between entities using simple patterns."""
 
     def __init__(self):
-        self.relation_patterns = [
+        raw_patterns = [
             (r'(\w+)\s+(?:is|was|are|were|be)\s+(?:a|an|the)?\s*(?:CEO|president|manager|director|employee|member)\s+(?:at|of|in)\s+(\w+)',
              'WORKS_AT'),
             (r'(\w+)\s+(?:founded|created|established)\s+(\w+)',
@@ -105,20 +299,35 @@ class RelationExtractor:
             (r'(\w+)\s+(?:located|based)\s+(?:in|at)\s+(\w+)',
              'LOCATED_IN'),
         ]
+        self.relation_patterns = tuple(
+            (re.compile(pattern, re.IGNORECASE), rel_type) for pattern, rel_type in raw_patterns
+        )
 
     def extract_relations(self, text: str, entities: List[Entity]) -> List[Relation]:
         """Extract relations between entities."""
         relations = []
-        entity_names = {e.name for e in entities}
+        # Exact (lowered) names answer most lookups with one hash probe
+        entity_names = {e.name.lower() for e in entities}
+        # All lowered names in one NUL-separated string: a word is a substring
+        # of some entity name iff it is a substring of this (words contain no
+        # NUL), so each check is one C-level search instead of a Python loop.
+        names_blob = '\0'.join(e.name.lower() for e in entities)
+        known: Dict[str, bool] = {}
+
+        def mentions_entity(word: str) -> bool:
+            found = known.get(word)
+            if found is None:
+                lowered = word.lower()
+                found = known[word] = lowered in entity_names or lowered in names_blob
+            return found
 
         for pattern, rel_type in self.relation_patterns:
-            for match in re.finditer(pattern, text, re.IGNORECASE):
+            for match in pattern.finditer(text):
                 groups = match.groups()
                 if len(groups) >= 2:
                     head, tail = groups[0], groups[1]
                     # Filter to entities we found
-                    if any(head.lower() in e.name.lower() for e in entities) and \
-                       any(tail.lower() in e.name.lower() for e in entities):
+                    if mentions_entity(head) and mentions_entity(tail):
                         relations.append(
                             Relation(
                                 head_entity=head,
@@ -134,30 +343,102 @@ class RelationExtractor:
 class UnstructuredETLPipeline:
     """Main ETL pipeline for unstructured text data."""
 
-    def __init__(self, use_transformer_ner: bool = False):
+    def __init__(
+        self,
+        use_transformer_ner: bool = False,
+        backend: Optional[Literal["regex", "spacy", "transformer"]] = None,
+    ):
         """Initialize the pipeline.
         
         Args:
             use_transformer_ner: If True, use HuggingFace transformers for NER (requires download).
                                 If False, use simple rule-based extraction.
+            backend: NER backend ("regex", "spacy" or "transformer"). Overrides
+                     use_transformer_ner when given. Unavailable backends fall
+                     back to "regex".
         """
         self.ner_extractor = SimpleNERExtractor()
         self.relation_extractor = RelationExtractor()
-        self.use_transformer = use_transformer_ner
+        self.backend = backend or ("transformer" if use_transformer_ner else "regex")
+        self.use_transformer = self.backend == "transformer"
+
+    @cached_property
+    def spacy_nlp(self):
+        """spaCy pipeline for the "spacy" backend, loaded on first use and shared.
+
+        Returns None (and falls back to the regex backend) if spaCy or the
+        model is not installed.
+        """
+        if self.backend != "spacy":
+            return None
+        key = f"spacy:{SPACY_NER_MODEL}"
+        if key not in _MODEL_CACHE:
+            try:
+                import spacy
+                _MODEL_CACHE[key] = spacy.load(SPACY_NER_MODEL, disable=["parser", "lemmatizer"])
+            except Exception as e:
+                logger.warning("spaCy NER not available (%s), falling back to rule-based extraction", e)
+                self.backend = "regex"
+                return None
+        return _MODEL_CACHE[key]
+
+    def extract_entities(self, text: str) -> List[Entity]:
+        """Extract entities from one text with the configured backend."""
+        if self.backend == "spacy" and self.spacy_nlp is not None:
+            return self._spacy_entities(self.spacy_nlp(text))
+        if self.use_transformer and self.transformer_ner is not None:
+            return self._extract_transformer_entities(text)
+        return self.ner_extractor.extract_entities(text)
+
+    def extract_entities_batch(self, texts: List[str]) -> List[List[Entity]]:
+        """Extract entities from many texts; spaCy streams them through nlp.pipe."""
+        if self.backend == "spacy" and self.spacy_nlp is not None:
+            docs = self.spacy_nlp.pipe(texts, n_process=os.cpu_count() or 1, batch_size=64)
+            return [self._spacy_entities(doc) for doc in docs]
+        return [self.extract_entities(text) for text in texts]
+
+    @staticmethod
+    def _spacy_entities(doc) -> List[Entity]:
+        return [
+            Entity(
+                name=ent.text,
+                entity_type=ent.label_,
+                start_char=ent.start_char,
+                end_char=ent.end_char,
+                confidence=0.85,
+            )
+            for ent in doc.ents
+        ]
 
-        if use_transformer_ner:
+    @cached_property
+    def transformer_ner(self):
+        """HuggingFace NER pipeline, loaded on first use and shared across instances.
+
+        Returns None (and disables transformer NER) if it cannot be loaded.
+        """
+        if not self.use_transformer:
+            return None
+        if TRANSFORMER_NER_MODEL not in _MODEL_CACHE:
             try:
+                import torch
                 from transformers import pipeline as hf_pipeline
-                self.transformer_ner = hf_pipeline("ner", model="dslim/bert-base-multilingual-cased-ner")
+                _MODEL_CACHE[TRANSFORMER_NER_MODEL] = hf_pipeline(
+                    "ner",
+                    model=TRANSFORMER_NER_MODEL,
+                    device=0 if torch.cuda.is_available() else -1,
+                )
             except Exception as e:
-                logger.warning(f"Transformer NER not available ({e}), falling back to rule-based extraction")
+                logger.warning("Transformer NER not available (%s), falling back to rule-based extraction", e)
                 self.use_transformer = False
+                return None
+        return _MODEL_CACHE[TRANSFORMER_NER_MODEL]
 
     async def process_unstructured_text(
         self,
         text: str,
         document_id: str = "unknown",
         chunk_size: int = 512,
+        entities: Optional[List[Entity]] = None,
     ) -> Dict[str, Any]:
         """Process unstructured text through full ETL pipeline.
 
@@ -165,6 +446,8 @@ class UnstructuredETLPipeline:
             text: Raw unstructured text
             document_id: Identifier for the source document
             chunk_size: Token-approximate chunk size for embeddings
+            entities: Entities already extracted for this text (e.g. from
+                      extract_entities_batch); extracted here when None
 
         Returns:
             Dict with keys:
@@ -175,24 +458,40 @@ class UnstructuredETLPipeline:
                 - graph_triples: list of (subject, predicate, object) tuples
                 - metadata: source and processing info
         """
-        # 1. Entity Extraction
-        entities = self.ner_extractor.extract_entities(text)
+        cache_key = None
+        if entities is None:
+            digest = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+            cache_key = (digest, chunk_size, document_id, self.backend)
+            cached = _RESULT_CACHE.get(cache_key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+
+        # 1. Entity extraction and chunking are independent; run them together
+        # Chunks are materialized in the worker thread; the result needs chunk_count
+        chunking = asyncio.to_thread(lambda: list(self._chunk_text(text, chunk_size)))
+        if entities is None:
+            entities, chunks = await asyncio.gather(
+                asyncio.to_thread(self.extract_entities, text),
+                chunking,
+            )
+        else:
+            chunks = await chunking
 
-        # 2. Relation Extraction
-        relations = self.relation_extractor.extract_relations(text, entities)
+        # 2. Relation Extraction (needs entities)
+        relations = await asyncio.to_thread(
+            self.relation_extractor.extract_relations, text, entities
+        )
 
         # 3. Generate Graph Triples from entities and relations
         graph_triples = self._generate_graph_triples(entities, relations, document_id)
 
-        # 4. Chunk text for embedding
-        chunks = self._chunk_text(text, chunk_size)
-
         result = {
             'text': text,
-            'entities': [asdict(e) for e in entities],
-            'relations': [asdict(r) for r in relations],
+            # to_dict rather than asdict: no recursive deepcopy of flat records
+            'entities': [e.to_dict() for e in entities],
+            'relations': [r.to_dict() for r in relations],
             'chunks': chunks,
-            'graph_triples': [asdict(t) for t in graph_triples],
+            'graph_triples': [t.to_dict() for t in graph_triples],
             'metadata': {
                 'source_document': document_id,
                 'entity_count': len(entities),
@@ -202,8 +501,61 @@ class UnstructuredETLPipeline:
             }
         }
 
+        if cache_key is not None:
+            if len(_RESULT_CACHE) >= _RESULT_CACHE_SIZE:
+                _RESULT_CACHE.pop(next(iter(_RESULT_CACHE)), None)
+            _RESULT_CACHE[cache_key] = copy.deepcopy(result)
+
         return result
 
+    def _extract_transformer_entities(self, text: str, window_size: int = 512) -> List[Entity]:
+        """Extract entities with the transformer model, batched over text windows.
+
+        The text is cut into non-overlapping windows at whitespace so the HF
+        pipeline can pad and batch them in one call; window-relative spans are
+        shifted back to offsets in `text`.
+        """
+        windows = list(self._text_windows(text, window_size))
+        if not windows:
+            return []
+
+        import torch
+        with torch.inference_mode():
+            raw = self.transformer_ner(
+                [window for _, window in windows],
+                batch_size=32,
+                aggregation_strategy="simple",
+            )
+
+        entities = []
+        for (offset, _), found in zip(windows, raw):
+            for item in found:
+                label = item.get('entity_group', item.get('entity', 'MISC'))
+                entities.append(
+                    Entity(
+                        name=item['word'],
+                        entity_type=_TRANSFORMER_LABELS.get(label, label),
+                        start_char=offset + item['start'],
+                        end_char=offset + item['end'],
+                        confidence=float(item['score']),
+                    )
+                )
+        return sorted(entities, key=lambda e: e.start_char)
+
+    @staticmethod
+    def _text_windows(text: str, window_size: int) -> Iterator[Tuple[int, str]]:
+        """Yield (start_offset, window) pieces of `text`, split at whitespace."""
+        start = end = None
+        for match in re.finditer(r'\S+', text):
+            if start is None:
+                start = match.start()
+            elif match.end() - start > window_size:
+                yield start, text[start:end]
+                start = match.start()
+            end = match.end()
+        if start is not None:
+            yield start, text[start:end]
+
     def _generate_graph_triples(
         self,
         entities: List[Entity],
@@ -211,92 +563,127 @@ class UnstructuredETLPipeline:
         doc_id: str,
     ) -> List[GraphTriple]:
         """Generate graph triples from entities and relations."""
-        triples = []
-
-        # Entity triples: (entity_name, HAS_TYPE, entity_type)
+        Triple = GraphTriple
+        # Identical for every MENTIONED_IN triple, so build it once; to_dict
+        # copies metadata, so serialized triples never share it
+        mention_meta = {'source': doc_id}
+
+        # Entity triples (entity_name, HAS_TYPE, entity_type) and document
+        # triples (entity, MENTIONED_IN, document) in a single pass
+        type_triples = []
+        mention_triples = []
+        add_type = type_triples.append
+        add_mention = mention_triples.append
         for entity in entities:
-            triples.append(
-                GraphTriple(
-                    subject=entity.name,
-                    predicate='HAS_TYPE',
-                    obj=entity.entity_type,
-                    metadata={'source': doc_id, 'confidence': entity.confidence},
-                )
-            )
+            name = entity.name
+            add_type(Triple(name, 'HAS_TYPE', entity.entity_type,
+                            {'source': doc_id, 'confidence': entity.confidence}))
+            add_mention(Triple(name, 'MENTIONED_IN', doc_id, mention_meta))
 
         # Relation triples: (head, relation_type, tail)
-        for relation in relations:
-            triples.append(
-                GraphTriple(
-                    subject=relation.head_entity,
-                    predicate=relation.relation_type,
-                    obj=relation.tail_entity,
-                    metadata={'source': doc_id, 'confidence': relation.confidence},
-                )
-            )
-
-        # Document triples: (entity, MENTIONED_IN, document)
-        for entity in entities:
-            triples.append(
-                GraphTriple(
-                    subject=entity.name,
-                    predicate='MENTIONED_IN',
-                    obj=doc_id,
-                    metadata={'source': doc_id},
-                )
-            )
+        relation_triples = [
+            Triple(r.head_entity, r.relation_type, r.tail_entity,
+                   {'source': doc_id, 'confidence': r.confidence})
+            for r in relations
+        ]
 
+        # Same order as before: types, relations, then mentions
+        triples = type_triples + relation_triples + mention_triples
         return triples
 
-    def _chunk_text(self, text: str, chunk_size: int = 512) -> List[str]:
+    def _chunk_text(self, text: str, chunk_size: int = 512) -> Iterator[str]:
         """Split text into overlapping chunks (approximate token-based).
         
         Args:
             text: Text to chunk
             chunk_size: Approximate number of characters per chunk (rough proxy for tokens)
 
-        Returns:
-            List of text chunks with ~50% overlap
+        Yields:
+            Text chunks with ~50% overlap, lazily
         """
         words = text.split()
-        chunks = []
-        current_chunk = []
-        current_size = 0
+        n = len(words)
+        if n == 0:
+            return
 
-        for word in words:
-            current_chunk.append(word)
-            current_size += len(word) + 1
+        # offsets[k] = size of words[:k] (each word counts len + 1 separator),
+        # so any window words[start:end] has size offsets[end] - offsets[start]
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(
+            np.fromiter((len(w) + 1 for w in words), dtype=np.int64, count=n),
+            out=offsets[1:],
+        )
 
-            if current_size >= chunk_size:
-                chunk_text = ' '.join(current_chunk)
-                chunks.append(chunk_text)
-                # Overlap: keep last ~50% of words
-                current_chunk = current_chunk[len(current_chunk) // 2:]
-                current_size = sum(len(w) + 1 for w in current_chunk)
+        start = end = 0
+        while True:
+            # First window end (past the previous one) reaching chunk_size
+            end = max(end + 1, int(np.searchsorted(offsets, offsets[start] + chunk_size)))
+            if end > n:
+                break
+            yield ' '.join(words[start:end])
+            # Overlap: keep last ~50% of words
+            start += (end - start) // 2
 
-        if current_chunk:
-            chunks.append(' '.join(current_chunk))
+        if start < n:
+            yield ' '.join(words[start:])
 
-        return chunks
+
+# Per-process pipeline reused by every document a pool worker handles
+_PIPELINE: Optional['UnstructuredETLPipeline'] = None
+
+
+def _process_one(text: str, doc_id: str, chunk_size: int) -> Dict[str, Any]:
+    """Process a single document inside a worker process."""
+    global _PIPELINE
+    if _PIPELINE is None:
+        _PIPELINE = UnstructuredETLPipeline(use_transformer_ner=False)
+    return asyncio.run(_PIPELINE.process_unstructured_text(text, doc_id, chunk_size))
 
 
 async def process_unstructured_batch(
     texts: List[Tuple[str, str]],
     chunk_size: int = 512,
+    backend: Literal["regex", "spacy"] = "regex",
 ) -> List[Dict[str, Any]]:
     """Process multiple unstructured documents in batch.
 
+    Extraction is pure-Python CPU work, so documents are spread over a process
+    pool rather than interleaved as coroutines on one GIL. With the spaCy
+    backend, NER for the whole batch goes through one nlp.pipe stream (which
+    does its own multiprocessing) and the rest runs in-process.
+
     Args:
         texts: List of (text, document_id) tuples
         chunk_size: Token-approx chunk size
+        backend: NER backend, "regex" or "spacy"
 
     Returns:
         List of processed results (one per document)
     """
-    pipeline = UnstructuredETLPipeline(use_transformer_ner=False)
-    tasks = [
-        pipeline.process_unstructured_text(text, doc_id, chunk_size)
-        for text, doc_id in texts
-    ]
-    results = await asyncio.gather(*tasks)
-    return results
+    if backend == "spacy":
+        pipeline = UnstructuredETLPipeline(backend="spacy")
+        batch_entities = await asyncio.to_thread(
+            pipeline.extract_entities_batch, [text for text, _ in texts]
+        )
+        return [
+            await pipeline.process_unstructured_text(text, doc_id, chunk_size, entities=entities)
+            for (text, doc_id), entities in zip(texts, batch_entities)
+        ]
+
+    if len(texts) <= 1:
+        # Not worth spawning workers for a single document
+        pipeline = UnstructuredETLPipeline(use_transformer_ner=False)
+        return [
+            await pipeline.process_unstructured_text(text, doc_id, chunk_size)
+            for text, doc_id in texts
+        ]
+
+    loop = asyncio.get_running_loop()
+    workers = min(len(texts), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            loop.run_in_executor(pool, _process_one, text, doc_id, chunk_size)
+            for text, doc_id in texts
+        ]
+        results = await asyncio.gather(*futures)
+    return list(results)
@@ -4,6 +4,8 @@ import os
 import asyncio
 import argparse
 from pathlib import Path
+import aiohttp
+import numpy as np
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -11,7 +13,13 @@ load_dotenv()
 
 async def fast_inject(csv_path: str = None, txt_path: str = None):
     """Fast injection with minimal LLM calls - best for bulk data"""
-    
+    # One pooled keep-alive session for every embedding request of the run
+    connector = aiohttp.TCPConnector(limit=64, keepalive_timeout=60)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await _fast_inject(csv_path, txt_path, session)
+
+
+async def _fast_inject(csv_path: str, txt_path: str, session: aiohttp.ClientSession):
     print("\n" + "="*60)
     print("FAST INJECTION MODE (Optimized for Speed)")
     print("="*60 + "\n")
@@ -19,24 +27,29 @@ async def fast_inject(csv_path: str = None, txt_path: str = None):
     try:
         from lightrag import LightRAG
         from lightrag.utils import EmbeddingFunc
-        from lightrag.llm.ollama import ollama_model_complete, ollama_embed
+        from lightrag.llm.ollama import ollama_model_complete
         from lightrag.utils import setup_logger
+        from lightrag_helpers import cached_embed_batch, get_embed_batch_size
     except Exception as e:
         print(f"Error importing LightRAG: {e}")
         return
 
     os.environ.setdefault('WORKING_DIR', './rag_local_fast')
+    batch_size = get_embed_batch_size()
     setup_logger("lightrag", level="WARNING")  # Reduce logging overhead
     
+    # Cached per (model, text), so re-runs and duplicate chunks skip Ollama
+    async def embed(texts):
+        return np.array(await cached_embed_batch(texts, session=session))
+    
     print("[INIT] Creating LightRAG instance (fast mode)...")
     rag = LightRAG(
         working_dir=os.environ['WORKING_DIR'],
         llm_model_func=ollama_model_complete,
         llm_model_name=os.environ.get('LLM_MODEL_NAME', 'phi'),
         llm_model_kwargs={"options": {"num_ctx": 4096}},  # Smaller context for speed
-        embedding_func=EmbeddingFunc(768, lambda t: ollama_embed(
-            t, os.environ.get('EMBEDDING_MODEL', 'nomic-embed-text')
-        )),
+        embedding_func=EmbeddingFunc(768, embed),
+        embedding_batch_num=batch_size,  # Texts per /api/embed request
         vector_storage='NanoVectorDBStorage',
         graph_storage='Neo4JStorage',
         chunk_token_size=256,  # Smaller chunks = faster processing
@@ -72,10 +85,22 @@ async def fast_inject(csv_path: str = None, txt_path: str = None):
             chunks = [text[i:i+chunk_size] for i in range(0, len(text), chunk_size)]
             print(f"  Split into: {len(chunks)} chunks")
             
-            # Insert directly without entity/relation extraction
-            for i, chunk in enumerate(chunks, 1):
-                await rag.ainsert(chunk)
-                print(f"  Chunk {i}/{len(chunks)} inserted...")
+            # Insert directly without entity/relation extraction, a batch of
+            # chunks per call so their embeddings go out in one request.
+            # Batches run concurrently, bounded by INJECT_CONCURRENCY (Ollama
+            # needs OLLAMA_NUM_PARALLEL > 1 to actually serve them in parallel)
+            batches = [chunks[i:i + batch_size] for i in range(0, len(chunks), batch_size)]
+            sem = asyncio.Semaphore(int(os.environ.get('INJECT_CONCURRENCY', '8')))
+            inserted = 0
+            
+            async def insert_batch(batch):
+                nonlocal inserted
+                async with sem:
+                    await rag.ainsert(batch)
+                inserted += len(batch)
+                print(f"  Chunks {inserted}/{len(chunks)} inserted...")
+            
+            await asyncio.gather(*(insert_batch(b) for b in batches))
             
             print(f"  All chunks stored [FAST]")
         except Exception as e:
@@ -113,6 +138,15 @@ BOTTLENECKS IDENTIFIED:
 """)
 
 
+def run(coro):
+    """asyncio.run on uvloop when it is installed (not available on Windows)"""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    return uvloop.run(coro)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Fast data injection")
     parser.add_argument("--csv", type=str, help="CSV file to ingest")
@@ -122,6 +156,6 @@ if __name__ == "__main__":
     args = parser.parse_args()
     
     if args.analyze:
-        asyncio.run(check_performance())
+        run(check_performance())
     else:
-        asyncio.run(fast_inject(args.csv, args.txt))
+        run(fast_inject(args.csv, args.txt))
@@ -13,13 +13,20 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import asyncio
-import json
 import os
+import time
 from datetime import datetime
 from neo4j import GraphDatabase
 from dotenv import load_dotenv
-import shutil
 import math
+import numpy as np
+
+from hybrid_store import EMBEDDING_DIM, HybridStorageManager, _RNG, _top_k_rows
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 load_dotenv()
 
@@ -127,233 +134,13 @@ class HybridSearchQueryV2(BaseModel):
     do_rerank: bool = False
 
 # ============================================================================
-# STORAGE MANAGER
+# MOCK QUERY EMBEDDING
 # ============================================================================
 
-class HybridStorageManager:
-    """Manages both Vector and Graph storage"""
-    
-    def __init__(self):
-        self.vector_store_path = "./rag_local/hybrid_vectors.json"
-        self.graph_store_path = "./rag_local/hybrid_graph.json"
-        self.neo4j_uri = os.environ.get('NEO4J_URI', 'neo4j://localhost:7687')
-        self.neo4j_user = os.environ.get('NEO4J_USERNAME', 'neo4j')
-        self.neo4j_password = os.environ.get('NEO4J_PASSWORD', 'password')
-        
-        self._ensure_storage()
-    
-    def _ensure_storage(self):
-        """Ensure storage files exist"""
-        os.makedirs("./rag_local", exist_ok=True)
-        os.makedirs("./rag_local/uploads", exist_ok=True)
-        
-        if not os.path.exists(self.vector_store_path):
-            with open(self.vector_store_path, 'w') as f:
-                json.dump({"nodes": {}}, f)
-        
-        if not os.path.exists(self.graph_store_path):
-            with open(self.graph_store_path, 'w') as f:
-                json.dump({"edges": []}, f)
-    
-    def add_node_to_vector_db(self, node_id: str, text: str, embedding: List[float], metadata: Dict):
-        """Add node to vector storage"""
-        with open(self.vector_store_path, 'r') as f:
-            data = json.load(f)
-        
-        data["nodes"][node_id] = {
-            "text": text,
-            "embedding": embedding,
-            "metadata": metadata,
-            "created_at": datetime.now().isoformat(),
-            "embedding_dim": len(embedding) if embedding else 0
-        }
-        
-        with open(self.vector_store_path, 'w') as f:
-            json.dump(data, f)
-    
-    def add_edge_to_graph_db(self, source_id: str, target_id: str, rel_type: str, weight: float, metadata: Dict):
-        """Add edge to graph storage"""
-        with open(self.graph_store_path, 'r') as f:
-            data = json.load(f)
-        
-        data["edges"].append({
-            "id": f"edge-{len(data['edges'])}",
-            "source": source_id,
-            "target": target_id,
-            "type": rel_type,
-            "weight": weight,
-            "metadata": metadata,
-            "created_at": datetime.now().isoformat()
-        })
-        
-        with open(self.graph_store_path, 'w') as f:
-            json.dump(data, f)
-    
-    def get_node_from_vector_db(self, node_id: str):
-        """Get node from vector storage"""
-        with open(self.vector_store_path, 'r') as f:
-            data = json.load(f)
-        
-        return data["nodes"].get(node_id)
-    
-    def get_all_nodes(self):
-        """Get all nodes from vector storage"""
-        with open(self.vector_store_path, 'r') as f:
-            data = json.load(f)
-        
-        return data["nodes"]
-    
-    def get_neighbors_from_graph(self, node_id: str, depth: int = 1):
-        """Get neighboring nodes from graph storage"""
-        with open(self.graph_store_path, 'r') as f:
-            data = json.load(f)
-        
-        neighbors = {}
-        visited = set()
-        
-        def traverse(current_id, current_depth):
-            if current_depth > depth or current_id in visited:
-                return
-            
-            visited.add(current_id)
-            
-            for edge in data["edges"]:
-                if edge["source"] == current_id:
-                    target = edge["target"]
-                    if target not in neighbors:
-                        neighbors[target] = {
-                            "edges": [],
-                            "depth": current_depth
-                        }
-                    neighbors[target]["edges"].append(edge)
-                    traverse(target, current_depth + 1)
-        
-        traverse(node_id, 0)
-        return neighbors
-    
-    def process_text_file(self, file_path: str, file_name: str) -> int:
-        """Process a text file and create nodes from content"""
-        nodes_created = 0
-        
-        try:
-            # Try multiple encodings
-            content = None
-            encodings = ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252', 'iso-8859-1']
-            
-            for encoding in encodings:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        content = f.read()
-                    break
-                except (UnicodeDecodeError, LookupError):
-                    continue
-            
-            if content is None:
-                # If all encodings fail, read as binary and decode with errors='ignore'
-                with open(file_path, 'rb') as f:
-                    content = f.read().decode('utf-8', errors='ignore')
-            
-            # Split by paragraphs or sentences
-            lines = [line.strip() for line in content.split('\n') if line.strip()]
-            
-            for i, line in enumerate(lines):
-                if len(line) > 10:  # Skip very short lines
-                    node_id = f"node-{len(self.get_all_nodes())}"
-                    embedding = [__import__('random').random() for _ in range(768)]
-                    metadata = {
-                        "source": "file_upload",
-                        "file_name": file_name,
-                        "line_index": i
-                    }
-                    self.add_node_to_vector_db(node_id, line, embedding, metadata)
-                    nodes_created += 1
-        
-        except Exception as e:
-            print(f"Error processing text file: {e}")
-        
-        return nodes_created
-    
-    def process_json_file(self, file_path: str, file_name: str) -> int:
-        """Process a JSON file and create nodes from content"""
-        nodes_created = 0
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            def extract_text(obj, path=""):
-                nonlocal nodes_created
-                
-                if isinstance(obj, dict):
-                    for key, value in obj.items():
-                        if isinstance(value, str) and len(value) > 10:
-                            node_id = f"node-{len(self.get_all_nodes())}"
-                            embedding = [__import__('random').random() for _ in range(768)]
-                            metadata = {
-                                "source": "file_upload",
-                                "file_name": file_name,
-                                "json_key": f"{path}.{key}" if path else key
-                            }
-                            self.add_node_to_vector_db(node_id, value, embedding, metadata)
-                            nodes_created += 1
-                        else:
-                            extract_text(value, f"{path}.{key}" if path else key)
-                
-                elif isinstance(obj, list):
-                    for i, item in enumerate(obj):
-                        if isinstance(item, str) and len(item) > 10:
-                            node_id = f"node-{len(self.get_all_nodes())}"
-                            embedding = [__import__('random').random() for _ in range(768)]
-                            metadata = {
-                                "source": "file_upload",
-                                "file_name": file_name,
-                                "array_index": i
-                            }
-                            self.add_node_to_vector_db(node_id, item, embedding, metadata)
-                            nodes_created += 1
-                        else:
-                            extract_text(item, f"{path}[{i}]")
-            
-            extract_text(data)
-        
-        except Exception as e:
-            print(f"Error processing JSON file: {e}")
-        
-        return nodes_created
-    
-    def process_pdf_file(self, file_path: str, file_name: str) -> int:
-        """Process a PDF file and create nodes from content"""
-        nodes_created = 0
-        
-        try:
-            from PyPDF2 import PdfReader
-            
-            with open(file_path, 'rb') as f:
-                pdf_reader = PdfReader(f)
-                
-                for page_num, page in enumerate(pdf_reader.pages):
-                    text = page.extract_text()
-                    
-                    # Split by paragraphs/lines
-                    lines = [line.strip() for line in text.split('\n') if line.strip()]
-                    
-                    for i, line in enumerate(lines):
-                        if len(line) > 10:  # Skip very short lines
-                            node_id = f"node-{len(self.get_all_nodes())}"
-                            embedding = [__import__('random').random() for _ in range(768)]
-                            metadata = {
-                                "source": "file_upload",
-                                "file_name": file_name,
-                                "page_number": page_num + 1,
-                                "line_index": i
-                            }
-                            self.add_node_to_vector_db(node_id, line, embedding, metadata)
-                            nodes_created += 1
-        
-        except Exception as e:
-            print(f"Error processing PDF file: {e}")
-        
-        return nodes_created
+# Fixed mock query for the /search endpoints, normalized once at import
+_MOCK_QUERY = np.random.default_rng(0).random(EMBEDDING_DIM, dtype=np.float32)
+_MOCK_QUERY /= np.linalg.norm(_MOCK_QUERY)
+_MOCK_QUERY.flags.writeable = False
 
 # ============================================================================
 # INITIALIZE STORAGE MANAGER
@@ -371,7 +158,7 @@ async def health_check():
     return {
         "status": "operational",
         "timestamp": datetime.now().isoformat(),
-        "vector_storage": "NanoVectorDB (JSON)",
+        "vector_storage": "NanoVectorDB (SQLite)",
         "graph_storage": "Neo4j + Local",
         "hybrid_mode": "enabled"
     }
@@ -383,27 +170,31 @@ async def health_check():
 @app.post("/nodes", response_model=NodeResponse, tags=["Node CRUD"])
 async def create_node(node: NodeCreate):
     """Create a node with text, metadata, and optional embedding"""
-    node_id = f"node-{len(storage_manager.get_all_nodes())}"
+    # Writes wait on the manager's write lock (an upload may hold it), so
+    # they run in a worker thread rather than blocking the event loop
+    node_id = (await asyncio.to_thread(storage_manager.new_node_ids))[0]
     
     # Generate embedding if not provided (mock with random values for now)
-    if node.embedding is None:
-        import random
-        node.embedding = [random.random() for _ in range(768)]
+    embedding = node.embedding
+    if embedding is None:
+        embedding = _RNG.random(EMBEDDING_DIM, dtype=np.float32)
     
-    storage_manager.add_node_to_vector_db(node_id, node.text, node.embedding, node.metadata or {})
+    await asyncio.to_thread(
+        storage_manager.add_node_to_vector_db, node_id, node.text, embedding, node.metadata or {}
+    )
     
     return {
         "id": node_id,
         "text": node.text,
         "metadata": node.metadata,
-        "embedding_dim": len(node.embedding),
+        "embedding_dim": len(embedding),
         "created_at": datetime.now().isoformat()
     }
 
 @app.get("/nodes/{node_id}", response_model=NodeResponse, tags=["Node CRUD"])
 async def get_node(node_id: str):
     """Get a node by ID"""
-    node = storage_manager.get_node_from_vector_db(node_id)
+    node = storage_manager.get_node_from_vector_db(node_id, include_embedding=False)
     
     if not node:
         raise HTTPException(status_code=404, detail="Node not found")
@@ -419,7 +210,7 @@ async def get_node(node_id: str):
 @app.get("/nodes", tags=["Node CRUD"])
 async def list_nodes(limit: int = 10):
     """List all nodes"""
-    nodes = storage_manager.get_all_nodes()
+    nodes = storage_manager.get_all_nodes(include_embeddings=False)
     
     result = []
     for node_id, node_data in list(nodes.items())[:limit]:
@@ -437,6 +228,8 @@ async def list_nodes(limit: int = 10):
 # FILE UPLOAD ENDPOINT
 # ============================================================================
 
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
 @app.post("/upload", response_model=FileUploadResponse, tags=["File Upload"])
 async def upload_file(file: UploadFile = File(...)):
     """
@@ -450,30 +243,34 @@ async def upload_file(file: UploadFile = File(...)):
         # Save uploaded file
         file_path = os.path.join(upload_dir, file.filename)
         with open(file_path, 'wb') as buffer:
-            shutil.copyfileobj(file.file, buffer)
+            # Stream in chunks with the blocking writes off the event loop
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await asyncio.to_thread(buffer.write, chunk)
         
         file_size = os.path.getsize(file_path)
         file_ext = os.path.splitext(file.filename)[1].lower()
         
-        nodes_created = 0
-        
         # Process based on file type
         if file_ext == '.txt' or file_ext == '.md':
-            nodes_created = storage_manager.process_text_file(file_path, file.filename)
+            process = storage_manager.process_text_file
         
         elif file_ext == '.json':
-            nodes_created = storage_manager.process_json_file(file_path, file.filename)
+            process = storage_manager.process_json_file
         
         elif file_ext == '.csv':
             # Process CSV as text lines for now
-            nodes_created = storage_manager.process_text_file(file_path, file.filename)
+            process = storage_manager.process_text_file
         
         elif file_ext == '.pdf':
-            nodes_created = storage_manager.process_pdf_file(file_path, file.filename)
+            process = storage_manager.process_pdf_file
         
         else:
             # Try to process as text
-            nodes_created = storage_manager.process_text_file(file_path, file.filename)
+            process = storage_manager.process_text_file
+        
+        # Reading, parsing and embedding the file run in a worker thread;
+        # its inserts take the manager's write lock like any other write
+        nodes_created = await asyncio.to_thread(process, file_path, file.filename)
         
         return {
             "filename": file.filename,
@@ -501,44 +298,48 @@ async def retrieve_local(query: LocalSearchQuery):
     Pure semantic similarity with ChromaDB-like approach
     Best for: Semantic questions, similarity search
     """
-    import time
     start_time = time.time()
     
     try:
-        query_embedding = [__import__('random').random() for _ in range(768)]
-        
-        all_nodes = storage_manager.get_all_nodes()
-        results = []
-        
-        for node_id, node_data in all_nodes.items():
-            similarity = _cosine_similarity(query_embedding, node_data["embedding"])
-            results.append({
-                "node_id": node_id,
-                "text": node_data["text"],
-                "similarity_score": similarity,
-                "source": "vector_db",
-                "metadata": node_data["metadata"]
-            })
-        
-        results.sort(key=lambda x: x["similarity_score"], reverse=True)
-        top_results = results[:query.top_k]
-        
-        confidence = sum(r["similarity_score"] for r in top_results) / len(top_results) if top_results else 0
-        latency = (time.time() - start_time) * 1000
-        
-        return {
-            "mode": "local",
-            "query": query.query_text,
-            "results": top_results,
-            "total_found": len(results),
-            "confidence": confidence,
-            "latency_ms": f"{latency:.2f}",
-            "description": "Vector-only semantic search from ChromaDB"
-        }
+        # The scan (or HNSW search) runs in a worker thread, off the event loop
+        return await asyncio.to_thread(_retrieve_local, query, start_time)
     
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Retrieval failed: {str(e)}")
 
+def _retrieve_local(query: LocalSearchQuery, start_time: float) -> Dict[str, Any]:
+    """Body of retrieve_local, run in a worker thread"""
+    query_embedding = _RNG.random(EMBEDDING_DIM, dtype=np.float32)
+    
+    node_ids, texts, _ = storage_manager.get_soa()
+    rows, scores = storage_manager.nearest_nodes(query_embedding, query.top_k)
+    # Metadata JSON is decoded for the winners only
+    metadata = storage_manager.get_nodes_metadata([node_ids[row] for row in rows.tolist()])
+    
+    top_results = []
+    for row, score in zip(rows.tolist(), scores.tolist()):
+        node_id = node_ids[row]
+        top_results.append({
+            "node_id": node_id,
+            "text": texts[row],
+            "similarity_score": score,
+            "source": "vector_db",
+            "metadata": metadata.get(node_id, {})
+        })
+    
+    confidence = sum(r["similarity_score"] for r in top_results) / len(top_results) if top_results else 0
+    latency = (time.time() - start_time) * 1000
+    
+    return {
+        "mode": "local",
+        "query": query.query_text,
+        "results": top_results,
+        "total_found": len(node_ids),
+        "confidence": confidence,
+        "latency_ms": f"{latency:.2f}",
+        "description": "Vector-only semantic search from ChromaDB"
+    }
+
 @app.post("/retrieve/global", tags=["Retrieval"])
 async def retrieve_global(query: GlobalSearchQuery):
     """
@@ -546,63 +347,70 @@ async def retrieve_global(query: GlobalSearchQuery):
     Entity-based reasoning with Neo4j-like approach
     Best for: Entity questions, relationship queries, KG reasoning
     """
-    import time
     start_time = time.time()
     
     try:
-        all_nodes = storage_manager.get_all_nodes()
-        graph_neighbors = {}
-        
-        query_tokens = query.query_text.lower().split()
-        matching_nodes = []
-        
-        for node_id, node_data in all_nodes.items():
-            node_text_lower = node_data["text"].lower()
-            matches = sum(1 for token in query_tokens if token in node_text_lower)
-            if matches > 0:
-                matching_nodes.append({
-                    "node_id": node_id,
-                    "text": node_data["text"],
-                    "relevance": matches / len(query_tokens)
-                })
-        
-        # Graph traversal from matching nodes
-        reachable_nodes = set()
-        for match in matching_nodes:
-            neighbors = storage_manager.get_neighbors_from_graph(match["node_id"], query.depth)
-            reachable_nodes.update(neighbors.keys())
-            reachable_nodes.add(match["node_id"])
-        
-        # Build result with relationships
-        with open("./rag_local/hybrid_graph.json", 'r') as f:
-            graph_data = json.load(f)
-        
-        relationships = []
-        for edge in graph_data["edges"]:
-            if edge["source"] in reachable_nodes or edge["target"] in reachable_nodes:
-                relationships.append({
-                    "source": edge["source"],
-                    "target": edge["target"],
-                    "type": edge["type"],
-                    "weight": edge["weight"]
-                })
-        
-        latency = (time.time() - start_time) * 1000
-        
-        return {
-            "mode": "global",
-            "query": query.query_text,
-            "entities_found": len(matching_nodes),
-            "reachable_nodes": len(reachable_nodes),
-            "relationships": relationships[:10],
-            "matching_entities": matching_nodes,
-            "latency_ms": f"{latency:.2f}",
-            "description": "Graph-only entity-based search from Neo4j"
-        }
+        # Keyword matching and traversal run in a worker thread, off the event loop
+        return await asyncio.to_thread(_retrieve_global, query, start_time)
     
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Retrieval failed: {str(e)}")
 
+def _retrieve_global(query: GlobalSearchQuery, start_time: float) -> Dict[str, Any]:
+    """Body of retrieve_global, run in a worker thread"""
+    node_ids, texts, _ = storage_manager.get_soa()
+    graph_neighbors = {}
+    
+    query_tokens = query.query_text.lower().split()
+    matching_nodes = []
+    
+    candidates = storage_manager.keyword_candidates(query_tokens)
+    
+    for node_id, text in zip(node_ids, texts):
+        if candidates is not None and node_id not in candidates:
+            continue
+        node_text_lower = text.lower()
+        matches = sum(1 for token in query_tokens if token in node_text_lower)
+        if matches > 0:
+            matching_nodes.append({
+                "node_id": node_id,
+                "text": text,
+                "relevance": matches / len(query_tokens)
+            })
+    
+    # Graph traversal from matching nodes
+    reachable_nodes = set()
+    for match in matching_nodes:
+        neighbors = storage_manager.get_neighbors_from_graph(match["node_id"], query.depth)
+        reachable_nodes.update(neighbors.keys())
+        reachable_nodes.add(match["node_id"])
+    
+    # Build result with relationships
+    graph_edges = storage_manager.get_all_edges()
+    
+    relationships = []
+    for edge in graph_edges:
+        if edge["source"] in reachable_nodes or edge["target"] in reachable_nodes:
+            relationships.append({
+                "source": edge["source"],
+                "target": edge["target"],
+                "type": edge["type"],
+                "weight": edge["weight"]
+            })
+    
+    latency = (time.time() - start_time) * 1000
+    
+    return {
+        "mode": "global",
+        "query": query.query_text,
+        "entities_found": len(matching_nodes),
+        "reachable_nodes": len(reachable_nodes),
+        "relationships": relationships[:10],
+        "matching_entities": matching_nodes,
+        "latency_ms": f"{latency:.2f}",
+        "description": "Graph-only entity-based search from Neo4j"
+    }
+
 @app.post("/retrieve/hybrid", tags=["Retrieval"])
 async def retrieve_hybrid(query: HybridSearchQueryV2):
     """
@@ -610,150 +418,156 @@ async def retrieve_hybrid(query: HybridSearchQueryV2):
     Fuses semantic search + entity relationships for maximum accuracy
     Best for: General questions, complex reasoning
     """
-    import time
     start_time = time.time()
     
     try:
-        # 1. Get vector search results
-        query_embedding = [__import__('random').random() for _ in range(768)]
-        all_nodes = storage_manager.get_all_nodes()
-        
-        vector_results = {}
-        for node_id, node_data in all_nodes.items():
-            similarity = _cosine_similarity(query_embedding, node_data["embedding"])
-            vector_results[node_id] = {
-                "text": node_data["text"],
-                "vector_score": similarity,
-                "metadata": node_data["metadata"]
-            }
-        
-        # 2. Get graph search results
-        query_tokens = query.query_text.lower().split()
-        graph_results = {}
-        
-        for node_id, node_data in all_nodes.items():
-            node_text_lower = node_data["text"].lower()
-            matches = sum(1 for token in query_tokens if token in node_text_lower)
-            if matches > 0:
-                degree = _get_node_degree(node_id)
-                graph_results[node_id] = {
-                    "text": node_data["text"],
-                    "graph_score": min((matches / len(query_tokens) + degree * 0.1), 1.0),
-                    "degree": degree
-                }
-        
-        # 3. Combine scores
-        combined_scores = {}
-        
-        for node_id, result in vector_results.items():
-            combined_scores[node_id] = {
-                "text": result["text"],
-                "vector_score": result["vector_score"],
-                "graph_score": graph_results.get(node_id, {}).get("graph_score", 0),
-                "metadata": result.get("metadata", {})
-            }
-        
-        for node_id, result in graph_results.items():
-            if node_id not in combined_scores:
-                combined_scores[node_id] = {
-                    "text": result["text"],
-                    "vector_score": 0,
-                    "graph_score": result["graph_score"],
-                    "metadata": {}
-                }
-        
-        # 4. Calculate hybrid scores
-        hybrid_results = []
-        for node_id, scores in combined_scores.items():
-            hybrid_score = (
-                scores["vector_score"] * query.vector_weight +
-                scores["graph_score"] * query.graph_weight
-            )
-            hybrid_results.append({
-                "node_id": node_id,
-                "text": scores["text"],
-                "vector_score": f"{scores['vector_score']:.4f}",
-                "graph_score": f"{scores['graph_score']:.4f}",
-                "hybrid_score": f"{hybrid_score:.4f}",
-                "source": "hybrid",
-                "metadata": scores.get("metadata", {})
-            })
-        
-        # 5. Sort by hybrid score
-        hybrid_results.sort(
-            key=lambda x: float(x["hybrid_score"]), 
-            reverse=True
-        )
-        
-        # Get top_k
-        final_results = hybrid_results[:query.top_k]
-        
-        # Get relationships
-        with open("./rag_local/hybrid_graph.json", 'r') as f:
-            graph_data = json.load(f)
-        
-        relationships = []
-        result_ids = {r["node_id"] for r in final_results}
-        for edge in graph_data["edges"]:
-            if edge["source"] in result_ids or edge["target"] in result_ids:
-                relationships.append({
-                    "source": edge["source"],
-                    "target": edge["target"],
-                    "type": edge["type"]
-                })
-        
-        confidence = sum(float(r["hybrid_score"]) for r in final_results) / len(final_results) if final_results else 0
-        latency = (time.time() - start_time) * 1000
-        
-        return {
-            "mode": "hybrid",
-            "query": query.query_text,
-            "results": final_results,
-            "total_candidates": len(hybrid_results),
-            "vector_weight": query.vector_weight,
-            "graph_weight": query.graph_weight,
-            "confidence": f"{confidence:.4f}",
-            "relationships": relationships[:5],
-            "latency_ms": f"{latency:.2f}",
-            "description": "Hybrid search combining vector + graph (BEST ACCURACY) ⭐"
-        }
+        # The scan and keyword matching run in a worker thread, off the event loop
+        return await asyncio.to_thread(_retrieve_hybrid, query, start_time)
     
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Retrieval failed: {str(e)}")
 
+def _retrieve_hybrid(query: HybridSearchQueryV2, start_time: float) -> Dict[str, Any]:
+    """Body of retrieve_hybrid, run in a worker thread"""
+    # 1. Get vector search results
+    query_embedding = _RNG.random(EMBEDDING_DIM, dtype=np.float32)
+    node_ids, texts, _ = storage_manager.get_soa()
+    
+    vector_scores = storage_manager.cosine_similarities(query_embedding)
+    # Nodes added (by an upload thread) after the vector scores were
+    # computed are left out of this query, so every column has one row per score
+    node_ids, texts = node_ids[:len(vector_scores)], texts[:len(vector_scores)]
+    
+    # 2. Get graph search results
+    query_tokens = query.query_text.lower().split()
+    graph_results = {}
+    
+    candidates = storage_manager.keyword_candidates(query_tokens)
+    
+    for node_id, text in zip(node_ids, texts):
+        if candidates is not None and node_id not in candidates:
+            continue
+        node_text_lower = text.lower()
+        matches = sum(1 for token in query_tokens if token in node_text_lower)
+        if matches > 0:
+            degree = storage_manager._degree.get(node_id, 0)
+            graph_results[node_id] = {
+                "text": text,
+                "graph_score": min((matches / len(query_tokens) + degree * 0.1), 1.0),
+                "degree": degree
+            }
+    
+    # 3. Combine scores: one score per node row, graph scores scattered in
+    graph_scores = np.zeros(len(node_ids), dtype=np.float64)
+    for node_id, result in graph_results.items():
+        graph_scores[storage_manager._node_rows[node_id]] = result["graph_score"]
+    
+    # 4. Calculate hybrid scores (kept numeric; only the winners get formatted)
+    hybrid_scores = vector_scores * query.vector_weight + graph_scores * query.graph_weight
+    
+    # 5. Get top_k by hybrid score
+    top_rows = _top_k_rows(hybrid_scores, query.top_k)
+    metadata = storage_manager.get_nodes_metadata([node_ids[row] for row in top_rows.tolist()])
+    final_results = []
+    for row in top_rows.tolist():
+        node_id = node_ids[row]
+        final_results.append({
+            "node_id": node_id,
+            "text": texts[row],
+            "vector_score": f"{vector_scores[row]:.4f}",
+            "graph_score": f"{graph_scores[row]:.4f}",
+            "hybrid_score": f"{hybrid_scores[row]:.4f}",
+            "source": "hybrid",
+            "metadata": metadata.get(node_id, {})
+        })
+    
+    # Get relationships
+    graph_edges = storage_manager.get_all_edges()
+    
+    relationships = []
+    result_ids = {r["node_id"] for r in final_results}
+    for edge in graph_edges:
+        if edge["source"] in result_ids or edge["target"] in result_ids:
+            relationships.append({
+                "source": edge["source"],
+                "target": edge["target"],
+                "type": edge["type"]
+            })
+    
+    confidence = float(hybrid_scores[top_rows].mean()) if len(top_rows) else 0
+    latency = (time.time() - start_time) * 1000
+    
+    return {
+        "mode": "hybrid",
+        "query": query.query_text,
+        "results": final_results,
+        "total_candidates": len(hybrid_scores),
+        "vector_weight": query.vector_weight,
+        "graph_weight": query.graph_weight,
+        "confidence": f"{confidence:.4f}",
+        "relationships": relationships[:5],
+        "latency_ms": f"{latency:.2f}",
+        "description": "Hybrid search combining vector + graph (BEST ACCURACY) ⭐"
+    }
+
 # ============================================================================
 # RETRIEVAL HELPER FUNCTIONS
 # ============================================================================
 
+if njit is not None:
+    @njit(fastmath=True, cache=True)
+    def _cosine_similarity_nb(a, b):
+        # Same semantics as the NumPy path: the dot product runs over the
+        # common length, each magnitude over its whole vector. One fused
+        # sweep covers the common length; only the longer vector has a tail
+        n = min(a.shape[0], b.shape[0])
+        dot = 0.0
+        na = 0.0
+        nb = 0.0
+        for i in range(n):
+            x = a[i]
+            y = b[i]
+            dot += x * y
+            na += x * x
+            nb += y * y
+        for i in range(n, a.shape[0]):
+            na += a[i] * a[i]
+        for i in range(n, b.shape[0]):
+            nb += b[i] * b[i]
+        if na == 0.0 or nb == 0.0:
+            return 0.0
+        return dot / (math.sqrt(na) * math.sqrt(nb))
+
 def _cosine_similarity(v1: List[float], v2: List[float]) -> float:
-    """Calculate cosine similarity between two vectors"""
-    dot_product = sum(a * b for a, b in zip(v1, v2))
-    magnitude1 = math.sqrt(sum(a ** 2 for a in v1))
-    magnitude2 = math.sqrt(sum(b ** 2 for b in v2))
+    """Calculate cosine similarity between two vectors
+    
+    Scalar fallback for one-off comparisons; whole-corpus scoring goes
+    through HybridStorageManager.cosine_similarities. Compiled with numba
+    when it is installed, vectorized NumPy otherwise.
+    """
+    a = np.asarray(v1, dtype=np.float32)
+    b = np.asarray(v2, dtype=np.float32)
+    if njit is not None:
+        return float(_cosine_similarity_nb(a, b))
     
-    if magnitude1 == 0 or magnitude2 == 0:
+    # Dot product over the common length, like zip(); magnitudes in full
+    n = min(a.shape[0], b.shape[0])
+    magnitude = np.sqrt(np.vdot(a, a) * np.vdot(b, b))
+    
+    if magnitude == 0:
         return 0.0
     
-    return dot_product / (magnitude1 * magnitude2)
+    return float(np.dot(a[:n], b[:n]) / magnitude)
 
 def _get_node_degree(node_id: str) -> int:
     """Get connectivity degree of a node"""
-    try:
-        with open("./rag_local/hybrid_graph.json", 'r') as f:
-            data = json.load(f)
-        
-        degree = 0
-        for edge in data["edges"]:
-            if edge["source"] == node_id or edge["target"] == node_id:
-                degree += 1
-        return degree
-    except:
-        return 0
+    return storage_manager._degree.get(node_id, 0)
 
 @app.post("/edges", response_model=EdgeResponse, tags=["Relationship CRUD"])
 async def create_edge(edge: EdgeCreate):
     """Create a relationship between two nodes"""
-    storage_manager.add_edge_to_graph_db(
+    new_edge = await asyncio.to_thread(
+        storage_manager.add_edge_to_graph_db,
         edge.source_id,
         edge.target_id,
         edge.relationship_type,
@@ -761,17 +575,12 @@ async def create_edge(edge: EdgeCreate):
         edge.metadata or {}
     )
     
-    with open("./rag_local/hybrid_graph.json", 'r') as f:
-        data = json.load(f)
-    
-    latest_edge = data["edges"][-1]
-    
     return {
-        "id": latest_edge["id"],
-        "source_id": latest_edge["source"],
-        "target_id": latest_edge["target"],
-        "relationship_type": latest_edge["type"],
-        "weight": latest_edge["weight"]
+        "id": new_edge["id"],
+        "source_id": new_edge["source"],
+        "target_id": new_edge["target"],
+        "relationship_type": new_edge["type"],
+        "weight": new_edge["weight"]
     }
 
 # ============================================================================
@@ -781,38 +590,26 @@ async def create_edge(edge: EdgeCreate):
 @app.post("/search/vector", tags=["Search"])
 async def vector_search(query: VectorSearchQuery):
     """Search using vector similarity (cosine)"""
-    import random
-    import math
+    # Mock embedding for query
+    query_embedding = _MOCK_QUERY
     
-    # Mock embedding generation for query
-    query_embedding = [random.random() for _ in range(768)]
+    node_ids, texts, _ = storage_manager.get_soa()
     
-    def cosine_similarity(v1, v2):
-        """Calculate cosine similarity between two vectors"""
-        dot_product = sum(a * b for a, b in zip(v1, v2))
-        magnitude1 = math.sqrt(sum(a ** 2 for a in v1))
-        magnitude2 = math.sqrt(sum(b ** 2 for b in v2))
-        
-        if magnitude1 == 0 or magnitude2 == 0:
-            return 0
-        
-        return dot_product / (magnitude1 * magnitude2)
-    
-    all_nodes = storage_manager.get_all_nodes()
+    # One matrix-vector product against the normalized embedding matrix,
+    # run in a worker thread so the event loop keeps serving requests
+    similarities = await asyncio.to_thread(storage_manager.cosine_similarities, query_embedding)
+    top_rows = _top_k_rows(similarities, query.top_k)
     
     results = []
-    for node_id, node_data in all_nodes.items():
-        similarity = cosine_similarity(query_embedding, node_data["embedding"])
+    for row in top_rows.tolist():
         results.append({
-            "node_id": node_id,
-            "text": node_data["text"],
-            "score": similarity,
+            "node_id": node_ids[row],
+            "text": texts[row],
+            "score": float(similarities[row]),
             "method": "vector-cosine"
         })
     
-    # Sort by similarity and return top_k
-    results.sort(key=lambda x: x["score"], reverse=True)
-    return {"query": query.query_text, "results": results[:query.top_k]}
+    return {"query": query.query_text, "results": results}
 
 # ============================================================================
 # GRAPH TRAVERSAL ENDPOINT
@@ -823,16 +620,16 @@ async def graph_traversal(start_id: str, depth: int = 2):
     """Traverse the graph from a starting node"""
     neighbors = storage_manager.get_neighbors_from_graph(start_id, depth)
     
-    result_nodes = []
-    for neighbor_id, neighbor_data in neighbors.items():
-        node = storage_manager.get_node_from_vector_db(neighbor_id)
-        if node:
-            result_nodes.append({
-                "node_id": neighbor_id,
-                "text": node["text"],
-                "depth": neighbor_data["depth"],
-                "edges_from_start": len(neighbor_data["edges"])
-            })
+    result_nodes = [
+        {
+            "node_id": neighbor_id,
+            "text": neighbor_data["text"],
+            "depth": neighbor_data["depth"],
+            "edges_from_start": len(neighbor_data["edges"])
+        }
+        for neighbor_id, neighbor_data in neighbors.items()
+        if neighbor_data["text"] is not None
+    ]
     
     return {
         "start_node": start_id,
@@ -850,73 +647,59 @@ async def hybrid_search(query: HybridSearchQuery):
     Hybrid search combining vector similarity and graph adjacency.
     This is the core feature that demonstrates the hybrid approach.
     """
-    import random
-    import math
-    
     # Step 1: Vector search
-    query_embedding = [random.random() for _ in range(768)]
-    
-    def cosine_similarity(v1, v2):
-        dot_product = sum(a * b for a, b in zip(v1, v2))
-        magnitude1 = math.sqrt(sum(a ** 2 for a in v1))
-        magnitude2 = math.sqrt(sum(b ** 2 for b in v2))
-        
-        if magnitude1 == 0 or magnitude2 == 0:
-            return 0
-        
-        return dot_product / (magnitude1 * magnitude2)
-    
-    all_nodes = storage_manager.get_all_nodes()
+    query_embedding = _MOCK_QUERY
+    
+    # Row-aligned node columns; everything below works on row indices
+    node_ids, texts, _ = storage_manager.get_soa()
+    
+    # Vector scores, all nodes in one matrix-vector product (in a worker thread)
+    similarities = await asyncio.to_thread(storage_manager.cosine_similarities, query_embedding)
+    vector_scores = similarities.astype(np.float64)
+    
+    # Step 2: Graph scores (how close to frequently connected nodes), from
+    # the in-memory degree map in one pass and normalized to 0-1. Nodes
+    # added while the vector scores were computed are left out of this query
+    n = len(vector_scores)
+    degrees = np.fromiter(
+        (_get_node_degree(node_id) for node_id in node_ids[:n]),
+        dtype=np.float64, count=n
+    )
+    graph_scores = np.minimum(degrees / 10.0, 1.0)
     
-    # Vector scores
-    vector_scores = {}
-    for node_id, node_data in all_nodes.items():
-        vector_scores[node_id] = cosine_similarity(query_embedding, node_data["embedding"])
+    # Step 3: Hybrid score
+    hybrid_scores = vector_scores * query.vector_weight + graph_scores * query.graph_weight
     
-    # Step 2: Graph scores (how close to frequently connected nodes)
-    graph_scores = {}
-    with open("./rag_local/hybrid_graph.json", 'r') as f:
-        graph_data = json.load(f)
+    # Only the top_k rows are materialized as result dicts, best first
+    top_rows = _top_k_rows(hybrid_scores, query.top_k)
+    top_vector = vector_scores[top_rows]
+    top_graph = graph_scores[top_rows]
     
-    for node_id in all_nodes.keys():
-        # Count edges connected to this node
-        edge_count = sum(1 for edge in graph_data["edges"] 
-                        if edge["source"] == node_id or edge["target"] == node_id)
-        graph_scores[node_id] = min(edge_count / 10.0, 1.0)  # Normalize to 0-1
+    # Determine source
+    sources = np.select(
+        [top_vector > 0.5, top_graph > 0.5], ["vector-only", "graph-only"], default="hybrid"
+    )
     
-    # Step 3: Hybrid score
-    hybrid_results = []
-    for node_id, node_data in all_nodes.items():
-        vector_score = vector_scores.get(node_id, 0)
-        graph_score = graph_scores.get(node_id, 0)
-        hybrid_score = (vector_score * query.vector_weight + 
-                       graph_score * query.graph_weight)
-        
-        # Determine source
-        if vector_score > 0.5:
-            source = "vector-only"
-        elif graph_score > 0.5:
-            source = "graph-only"
-        else:
-            source = "hybrid"
-        
-        hybrid_results.append({
-            "node_id": node_id,
-            "text": node_data["text"],
+    hybrid_results = [
+        {
+            "node_id": node_ids[row],
+            "text": texts[row],
             "vector_score": vector_score,
             "graph_score": graph_score,
             "hybrid_score": hybrid_score,
             "source": source
-        })
-    
-    # Sort by hybrid score
-    hybrid_results.sort(key=lambda x: x["hybrid_score"], reverse=True)
+        }
+        for row, vector_score, graph_score, hybrid_score, source in zip(
+            top_rows.tolist(), top_vector.tolist(), top_graph.tolist(),
+            hybrid_scores[top_rows].tolist(), sources.tolist()
+        )
+    ]
     
     return {
         "query": query.query_text,
         "vector_weight": query.vector_weight,
         "graph_weight": query.graph_weight,
-        "results": hybrid_results[:query.top_k]
+        "results": hybrid_results
     }
 
 # ============================================================================
@@ -926,16 +709,13 @@ async def hybrid_search(query: HybridSearchQuery):
 @app.get("/stats", tags=["System"])
 async def get_stats():
     """Get system statistics"""
-    all_nodes = storage_manager.get_all_nodes()
-    
-    with open("./rag_local/hybrid_graph.json", 'r') as f:
-        graph_data = json.load(f)
+    counts = storage_manager.stats()
     
     return {
-        "total_nodes": len(all_nodes),
-        "total_edges": len(graph_data["edges"]),
-        "vector_db_size": len(all_nodes),
-        "graph_db_size": len(graph_data["edges"]),
+        "total_nodes": counts["node_count"],
+        "total_edges": counts["edge_count"],
+        "vector_db_size": counts["node_count"],
+        "graph_db_size": counts["edge_count"],
         "vector_dimension": 768,
         "timestamp": datetime.now().isoformat()
     }
@@ -1017,4 +797,5 @@ if __name__ == "__main__":
     print("[*] Docs: http://localhost:8001/docs")
     print("="*70 + "\n")
     
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    # loop/http "auto" pick uvloop and httptools whenever they are installed
+    uvicorn.run(app, host="0.0.0.0", port=8001, loop="auto", http="auto")
@@ -0,0 +1,765 @@
+"""
+SQLite-backed node and edge storage for the hybrid database.
+
+HybridStorageManager keeps the nodes and edges in ./rag_local/hybrid_store.db
+and mirrors them in memory (embedding matrix, keyword postings, adjacency)
+for scoring. It has no web dependencies, so hybrid_db_api serves it over HTTP
+and the retrieval engine and tests can use the same store directly.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Optional, Dict, Tuple
+import numpy as np
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# ============================================================================
+# EMBEDDING HELPERS
+# ============================================================================
+
+EMBEDDING_DIM = 768
+# Source of the mock embeddings; one vectorized draw per vector (or batch)
+_RNG = np.random.default_rng()
+# Below this many nodes an exact scan is as fast as HNSW and always exact
+ANN_MIN_NODES = int(os.environ.get('ANN_MIN_NODES', '10000'))
+# "int8" stores the HNSW vectors 8-bit scalar-quantized: 4x less memory to stream.
+# With numba installed the exact scans also score int8 codes (per-row scale)
+EMBEDDING_QUANTIZATION = os.environ.get('EMBEDDING_QUANTIZATION', 'none').lower()
+_INT8_SCAN = EMBEDDING_QUANTIZATION == "int8" and njit is not None
+_WORD_RE = re.compile(r"\w+")
+
+def _unit_vector(embedding) -> np.ndarray:
+    """L2-normalized float32 copy of an embedding, as an EMBEDDING_DIM-wide matrix row
+    
+    Embeddings of another dimension come back as zeros (the manager scores
+    those from _normalized copies instead), as do zero vectors, which have
+    no direction and score 0.
+    """
+    v = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    if embedding is not None and len(embedding) == EMBEDDING_DIM:
+        v[:] = embedding
+        norm = np.linalg.norm(v)
+        if norm > 0:
+            v /= norm
+    return v
+
+def _normalized(embedding) -> np.ndarray:
+    """L2-normalized float32 copy of an embedding of any width (zeros stay zeros)"""
+    v = np.array(embedding, dtype=np.float32).reshape(-1)
+    norm = np.linalg.norm(v)
+    if norm > 0:
+        v /= norm
+    return v
+
+def _truncated_cosine(a: np.ndarray, b: np.ndarray) -> float:
+    """Cosine of two normalized vectors of any widths, zip()-style
+    
+    The dot product runs over the common length and each magnitude over
+    its whole vector, the same score as the scalar _cosine_similarity in
+    hybrid_db_api.
+    """
+    n = min(a.shape[0], b.shape[0])
+    return float(np.dot(a[:n], b[:n]))
+
+def _top_k_rows(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores, best first, without sorting all of them"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=int)
+    rows = np.argpartition(-scores, k - 1)[:k]
+    return rows[np.argsort(-scores[rows], kind="stable")]
+
+def _quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 codes and scales, so vectors ~= codes * scales[:, None]"""
+    vectors = np.atleast_2d(vectors)
+    scales = (np.abs(vectors).max(axis=1) / 127).astype(np.float32)
+    codes = np.rint(vectors / np.where(scales > 0, scales, 1)[:, None]).astype(np.int8)
+    return codes, scales
+
+if njit is not None:
+    @njit(cache=True, nogil=True)
+    def _int8_dots_nb(codes, query_codes):
+        # int8 products summed in int32; LLVM widens and vectorizes the inner
+        # loop. Its bound is the module constant EMBEDDING_DIM, which numba
+        # folds in at compile time (rows always have that width), so the
+        # loop is fully unrolled with no remainder handling
+        out = np.empty(codes.shape[0], dtype=np.int32)
+        for i in range(codes.shape[0]):
+            acc = np.int32(0)
+            for j in range(EMBEDDING_DIM):
+                acc += np.int32(codes[i, j]) * np.int32(query_codes[j])
+            out[i] = acc
+        return out
+
+# ============================================================================
+# STORAGE MANAGER
+# ============================================================================
+
+class HybridStorageManager:
+    """Manages both Vector and Graph storage"""
+    
+    def __init__(self):
+        self.db_path = "./rag_local/hybrid_store.db"
+        # Pre-SQLite JSON stores, imported once if present
+        self.vector_store_path = "./rag_local/hybrid_vectors.json"
+        self.graph_store_path = "./rag_local/hybrid_graph.json"
+        self.neo4j_uri = os.environ.get('NEO4J_URI', 'neo4j://localhost:7687')
+        self.neo4j_user = os.environ.get('NEO4J_USERNAME', 'neo4j')
+        self.neo4j_password = os.environ.get('NEO4J_PASSWORD', 'password')
+        # Held by every write (and for a whole transaction()), so writers in
+        # worker threads - file uploads - never interleave on the connection
+        # or the in-memory columns. Reads take no lock.
+        self._write_lock = threading.RLock()
+        
+        self._ensure_storage()
+        
+        # Node columns, row i of each describing the same node (see get_soa):
+        # L2-normalized float32 embeddings, so cosine similarity against the
+        # whole corpus is a single matrix-vector product, plus ids and texts
+        self._emb_buffer = np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+        self._node_ids: List[str] = []
+        self._node_texts: List[str] = []
+        self._node_rows: Dict[str, int] = {}
+        # int8 codes and per-row scales of the same rows, kept only with _INT8_SCAN
+        self._q8_buffer = np.zeros((0, EMBEDDING_DIM), dtype=np.int8)
+        self._q8_scales = np.zeros(0, dtype=np.float32)
+        # Optional FAISS HNSW index over the same rows; built on first use
+        # and extended with rows added since, rebuilt if a row is overwritten
+        self._ann_index = None
+        self._ann_rows = 0
+        # Searches run in worker threads, and one of them builds the index
+        # lazily: only one thread at a time builds, extends or searches it
+        self._ann_lock = threading.Lock()
+        # Rows whose embedding is not EMBEDDING_DIM wide: their matrix row stays
+        # zero and they are scored from this normalized copy (_truncated_cosine)
+        self._other_units: Dict[int, np.ndarray] = {}
+        # Lowercased word -> ids of nodes whose text contains it
+        self._postings: Dict[str, set] = defaultdict(set)
+        rows = self.conn.execute("SELECT id, text, embedding FROM nodes ORDER BY rowid").fetchall()
+        self._load_columns(rows)
+        for node_id, text, _ in rows:
+            self._index_text(node_id, text)
+        # Ids are minted as node-<n> from this counter rather than re-counting the store
+        self._next_id = len(rows)
+        
+        # All edges in insertion order, read from the table once and then
+        # appended to on every write, so queries never go back to disk
+        self._edges: List[Dict] = []
+        # Outgoing edges per source node, so traversal never rescans the edge table
+        self._adj: Dict[str, List[Dict]] = defaultdict(list)
+        # Number of edges touching each node (a self-loop counts once)
+        self._degree: Counter = Counter()
+        for edge in self._load_edges():
+            self._track_edge(edge)
+    
+    def _track_edge(self, edge: Dict):
+        """Record an edge in the edge list, adjacency index and degree counts"""
+        self._edges.append(edge)
+        self._adj[edge["source"]].append(edge)
+        self._degree[edge["source"]] += 1
+        if edge["target"] != edge["source"]:
+            self._degree[edge["target"]] += 1
+    
+    @property
+    def _emb_matrix(self) -> np.ndarray:
+        """Normalized embedding matrix of shape (N, EMBEDDING_DIM)"""
+        return self._emb_buffer[:len(self._node_ids)]
+    
+    def get_soa(self) -> Tuple[List[str], List[str], np.ndarray]:
+        """Node ids, texts and the normalized embedding matrix as parallel columns
+        
+        Row i of each describes the same node. These are the live columns,
+        current after every insert, so callers must not modify them.
+        """
+        return self._node_ids, self._node_texts, self._emb_matrix
+    
+    def new_node_ids(self, count: int = 1) -> List[str]:
+        """Reserve the next `count` node ids"""
+        with self._write_lock:
+            first = self._next_id
+            self._next_id += count
+        return [f"node-{n}" for n in range(first, first + count)]
+    
+    def _load_columns(self, rows):
+        """Fill the node columns from stored (id, text, embedding BLOB) rows in one pass"""
+        n = len(rows)
+        self._emb_buffer = np.zeros((max(64, n), EMBEDDING_DIM), dtype=np.float32)
+        self._node_ids = [node_id for node_id, _, _ in rows]
+        self._node_texts = [text for _, text, _ in rows]
+        self._node_rows = {node_id: row for row, node_id in enumerate(self._node_ids)}
+        
+        # Blobs are raw float32 with a fixed stride, so joined they are the matrix;
+        # other dimensions stay zero rows, as in _unit_vector
+        stride = EMBEDDING_DIM * np.dtype(np.float32).itemsize
+        valid = [row for row, (_, _, blob) in enumerate(rows) if blob is not None and len(blob) == stride]
+        self._other_units = {
+            row: _normalized(np.frombuffer(blob, dtype=np.float32))
+            for row, (_, _, blob) in enumerate(rows) if blob and len(blob) != stride
+        }
+        if valid:
+            joined = b"".join(rows[row][2] for row in valid)
+            self._emb_buffer[valid] = np.frombuffer(joined, dtype=np.float32).reshape(-1, EMBEDDING_DIM)
+        
+        matrix = self._emb_buffer[:n]
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        
+        if _INT8_SCAN:
+            self._q8_buffer = np.zeros(self._emb_buffer.shape, dtype=np.int8)
+            self._q8_scales = np.zeros(len(self._emb_buffer), dtype=np.float32)
+            self._q8_buffer[:n], self._q8_scales[:n] = _quantize_int8(matrix)
+    
+    def _grow_columns(self, capacity: int):
+        """Reallocate the array columns with room for `capacity` rows"""
+        rows = len(self._node_ids)
+        grown = np.zeros((capacity, EMBEDDING_DIM), dtype=np.float32)
+        grown[:rows] = self._emb_buffer[:rows]
+        self._emb_buffer = grown
+        if _INT8_SCAN:
+            codes = np.zeros((capacity, EMBEDDING_DIM), dtype=np.int8)
+            codes[:rows] = self._q8_buffer[:rows]
+            scales = np.zeros(capacity, dtype=np.float32)
+            scales[:rows] = self._q8_scales[:rows]
+            self._q8_buffer, self._q8_scales = codes, scales
+    
+    def _index_node(self, node_id: str, text: str, embedding: List[float]):
+        """Add or overwrite a node's row in the columns and its words in the postings"""
+        row = self._node_rows.get(node_id)
+        is_new = row is None
+        if is_new:
+            row = len(self._node_ids)
+            if row == len(self._emb_buffer):
+                self._grow_columns(max(64, 2 * row))
+        self._emb_buffer[row] = _unit_vector(embedding)
+        if _INT8_SCAN:
+            codes, scales = _quantize_int8(self._emb_buffer[row])
+            self._q8_buffer[row], self._q8_scales[row] = codes[0], scales[0]
+        if embedding is not None and 0 < len(embedding) != EMBEDDING_DIM:
+            self._other_units[row] = _normalized(embedding)
+        else:
+            self._other_units.pop(row, None)
+        if not is_new:
+            # Dropped after the row is rewritten, so an index being built
+            # meanwhile (which holds the lock) is dropped along with it
+            with self._ann_lock:
+                if row < self._ann_rows:
+                    self._ann_index = None
+        # A new row becomes visible (via _node_ids) only once it is filled in,
+        # so a search scoring in a worker thread never sees a half-written row
+        if is_new:
+            self._node_texts.append(text)
+            self._node_ids.append(node_id)
+            self._node_rows[node_id] = row
+        else:
+            self._node_texts[row] = text
+        self._index_text(node_id, text)
+    
+    def _index_text(self, node_id: str, text: str):
+        """Add a node's words to the keyword postings"""
+        for word in set(_WORD_RE.findall(text.lower())):
+            self._postings[word].add(node_id)
+    
+    def keyword_candidates(self, query_tokens: List[str]) -> Optional[set]:
+        """Ids of nodes whose text may contain one of the (lowercased) query tokens.
+        
+        A token made only of word characters can only occur inside a single
+        word, so the postings of the words containing it cover every match.
+        Returns None when some token has other characters and every node
+        has to be checked.
+        """
+        candidates = set()
+        # A snapshot of the postings, which a writer thread may be extending
+        postings = list(self._postings.items())
+        for token in set(query_tokens):
+            if not _WORD_RE.fullmatch(token):
+                return None
+            for word, node_ids in postings:
+                if token in word:
+                    candidates |= node_ids
+        return candidates
+    
+    def cosine_similarities(self, query_embedding: List[float]) -> np.ndarray:
+        """Cosine similarity of the query against every node, ordered like _node_ids
+        
+        Rows are normalized when indexed and the query once here, so each
+        score is a plain dot product with no per-node magnitudes. With
+        _INT8_SCAN the dot products run on int8 codes, reading a quarter of
+        the bytes, and are rescaled afterwards (about 1e-3 absolute error).
+        
+        Queries and nodes of other widths get the zip()-style cosine of
+        _truncated_cosine, so they still rank instead of scoring 0.
+        """
+        if query_embedding is not None and len(query_embedding) == EMBEDDING_DIM:
+            q = _unit_vector(query_embedding)
+            if _INT8_SCAN:
+                n = len(self._node_ids)
+                codes, scales = _quantize_int8(q)
+                dots = _int8_dots_nb(self._q8_buffer[:n], codes[0])
+                scores = np.multiply(dots, self._q8_scales[:n] * scales[0], dtype=np.float32)
+            else:
+                scores = self._emb_matrix @ q
+        else:
+            # Matrix rows are normalized, so a product over the common
+            # columns is already the truncated cosine
+            q = _normalized(query_embedding if query_embedding is not None else [])
+            width = min(q.shape[0], EMBEDDING_DIM)
+            scores = self._emb_matrix[:, :width] @ q[:width]
+        return self._score_other_rows(scores, q)
+    
+    def _score_other_rows(self, scores: np.ndarray, q: np.ndarray) -> np.ndarray:
+        """Fill in the scores of the rows that are not EMBEDDING_DIM wide"""
+        for row, unit in list(self._other_units.items()):
+            if row < len(scores):
+                scores[row] = _truncated_cosine(unit, q)
+        return scores
+    
+    def _ann_search(self, query_embedding: List[float], k: int):
+        """Approximate top-k (rows, scores) from the HNSW index"""
+        q = _unit_vector(query_embedding)
+        if not q.any():
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=np.float32)
+        
+        with self._ann_lock:
+            # Rows visible now; an upload thread may be appending more
+            n = len(self._node_ids)
+            if self._ann_index is None:
+                # Rows are L2-normalized, so inner product is cosine similarity
+                if EMBEDDING_QUANTIZATION == "int8":
+                    # Per-dimension ranges come from the rows present at build time;
+                    # later rows outside them are clipped, which only costs recall
+                    self._ann_index = faiss.IndexHNSWSQ(
+                        EMBEDDING_DIM, faiss.ScalarQuantizer.QT_8bit, 32, faiss.METRIC_INNER_PRODUCT
+                    )
+                    self._ann_index.train(self._emb_buffer[:n])
+                else:
+                    self._ann_index = faiss.IndexHNSWFlat(EMBEDDING_DIM, 32, faiss.METRIC_INNER_PRODUCT)
+                self._ann_index.hnsw.efConstruction = 200
+                self._ann_rows = 0
+            if self._ann_rows < n:
+                self._ann_index.add(self._emb_buffer[self._ann_rows:n])
+                self._ann_rows = n
+            
+            self._ann_index.hnsw.efSearch = max(64, k)
+            scores, rows = self._ann_index.search(q.reshape(1, -1), k)
+        found = rows[0] >= 0
+        return rows[0][found], scores[0][found]
+    
+    def nearest_nodes(self, query_embedding: List[float], k: int):
+        """Top-k (rows, scores) by cosine similarity, best first
+        
+        Uses the FAISS HNSW index (int8 with EMBEDDING_QUANTIZATION=int8) when
+        faiss is installed and the corpus has at least ANN_MIN_NODES nodes,
+        otherwise an exact scan.
+        """
+        k = min(k, len(self._node_ids))
+        if k <= 0:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=np.float32)
+        full_width = query_embedding is not None and len(query_embedding) == EMBEDDING_DIM
+        if faiss is not None and len(self._node_ids) >= ANN_MIN_NODES and full_width:
+            other = list(self._other_units.items())
+            if not other:
+                return self._ann_search(query_embedding, k)
+            # The index holds the other-width rows as zero vectors, so ask for
+            # enough extra hits to drop them, score them exactly instead and
+            # merge them into the candidates
+            rows, scores = self._ann_search(query_embedding, min(k + len(other), len(self._node_ids)))
+            q = _unit_vector(query_embedding)
+            keep = ~np.isin(rows, [row for row, _ in other])
+            rows = np.concatenate([rows[keep], np.array([row for row, _ in other], dtype=rows.dtype)])
+            scores = np.concatenate([
+                scores[keep], np.array([_truncated_cosine(unit, q) for _, unit in other], dtype=np.float32)
+            ])
+            top = _top_k_rows(scores, k)
+            return rows[top], scores[top]
+        
+        sims = self.cosine_similarities(query_embedding)
+        rows = _top_k_rows(sims, k)
+        return rows, sims[rows]
+    
+    def _ensure_storage(self):
+        """Ensure the storage directory and database schema exist"""
+        os.makedirs("./rag_local", exist_ok=True)
+        os.makedirs("./rag_local/uploads", exist_ok=True)
+        
+        # Autocommit connection; bulk writes opt into one transaction via transaction()
+        self.conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS nodes (
+                id TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                embedding BLOB,
+                embedding_dim INTEGER NOT NULL,
+                metadata TEXT,
+                created_at TEXT NOT NULL
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS edges (
+                seq INTEGER PRIMARY KEY,
+                id TEXT NOT NULL,
+                source TEXT NOT NULL,
+                target TEXT NOT NULL,
+                type TEXT NOT NULL,
+                weight REAL,
+                metadata TEXT,
+                created_at TEXT NOT NULL
+            )
+        """)
+        self._in_transaction = False
+        self._import_json_stores()
+    
+    def _import_json_stores(self):
+        """Copy nodes and edges from the old JSON files into an empty database"""
+        if self.conn.execute("SELECT EXISTS (SELECT 1 FROM nodes UNION ALL SELECT 1 FROM edges)").fetchone()[0]:
+            return
+        
+        with self.transaction():
+            if os.path.exists(self.vector_store_path):
+                with open(self.vector_store_path, 'r') as f:
+                    nodes = json.load(f).get("nodes", {})
+                for node_id, node in nodes.items():
+                    self._insert_node(node_id, node["text"], node["embedding"],
+                                      node.get("metadata") or {}, node["created_at"])
+            
+            if os.path.exists(self.graph_store_path):
+                with open(self.graph_store_path, 'r') as f:
+                    edges = json.load(f).get("edges", [])
+                for edge in edges:
+                    self._insert_edge(edge["source"], edge["target"], edge["type"], edge["weight"],
+                                      edge.get("metadata") or {}, edge["created_at"])
+    
+    @contextmanager
+    def transaction(self):
+        """Group many inserts into a single commit (re-entrant), holding the write lock"""
+        with self._write_lock:
+            if self._in_transaction:
+                yield
+                return
+            
+            # Always commit: rows written before an error are kept, exactly as
+            # they were when every insert committed on its own, and the
+            # in-memory embedding index stays in step with the table
+            self.conn.execute("BEGIN")
+            self._in_transaction = True
+            try:
+                yield
+            finally:
+                self._in_transaction = False
+                self.conn.execute("COMMIT")
+    
+    # An upsert rather than INSERT OR REPLACE: REPLACE deletes the old row and
+    # inserts a new one with a new rowid, so an overwritten node would move to
+    # the end of ORDER BY rowid while keeping its place in the in-memory columns
+    _INSERT_NODE_SQL = (
+        "INSERT INTO nodes (id, text, embedding, embedding_dim, metadata, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(id) DO UPDATE SET text = excluded.text, embedding = excluded.embedding, "
+        "embedding_dim = excluded.embedding_dim, metadata = excluded.metadata, "
+        "created_at = excluded.created_at"
+    )
+    
+    @staticmethod
+    def _node_params(node_id: str, text: str, embedding: List[float], metadata: Dict, created_at: str):
+        dim = len(embedding) if embedding is not None else 0
+        blob = np.asarray(embedding, dtype=np.float32).tobytes() if dim else None
+        return (node_id, text, blob, dim, json.dumps(metadata), created_at)
+    
+    def _insert_node(self, node_id: str, text: str, embedding: List[float], metadata: Dict, created_at: str):
+        self.conn.execute(self._INSERT_NODE_SQL, self._node_params(node_id, text, embedding, metadata, created_at))
+    
+    def _insert_edge(self, source_id: str, target_id: str, rel_type: str, weight: float, metadata: Dict, created_at: str) -> Dict:
+        # Edges are never deleted, so seq runs 1..E and MAX(seq) is the edge
+        # count, read off the end of the rowid b-tree instead of counting it
+        (edge_id,) = self.conn.execute(
+            "INSERT INTO edges (id, source, target, type, weight, metadata, created_at) "
+            "VALUES ('edge-' || (SELECT COALESCE(MAX(seq), 0) FROM edges), ?, ?, ?, ?, ?, ?) RETURNING id",
+            (source_id, target_id, rel_type, weight, json.dumps(metadata), created_at)
+        ).fetchone()
+        return {
+            "id": edge_id,
+            "source": source_id,
+            "target": target_id,
+            "type": rel_type,
+            "weight": weight,
+            "metadata": metadata,
+            "created_at": created_at
+        }
+    
+    @staticmethod
+    def _node_from_row(row, include_embedding: bool = True) -> Dict:
+        text, blob, embedding_dim, metadata, created_at = row
+        node = {
+            "text": text,
+            "metadata": json.loads(metadata) if metadata else {},
+            "created_at": created_at,
+            "embedding_dim": embedding_dim
+        }
+        if include_embedding:
+            # Zero-copy read-only float32 view of the stored blob, not 768 Python floats
+            node["embedding"] = np.frombuffer(blob, dtype=np.float32) if blob else np.zeros(0, dtype=np.float32)
+        return node
+    
+    def add_node_to_vector_db(self, node_id: str, text: str, embedding: List[float], metadata: Dict):
+        """Add node to vector storage"""
+        with self._write_lock:
+            self._insert_node(node_id, text, embedding, metadata, datetime.now().isoformat())
+            self._index_node(node_id, text, embedding)
+    
+    def bulk_add_nodes(self, nodes: List[tuple]):
+        """Add many (node_id, text, embedding, metadata) nodes in one transaction"""
+        created_at = datetime.now().isoformat()
+        with self.transaction():
+            self.conn.executemany(
+                self._INSERT_NODE_SQL,
+                [self._node_params(node_id, text, embedding, metadata, created_at)
+                 for node_id, text, embedding, metadata in nodes]
+            )
+            for node_id, text, embedding, _ in nodes:
+                self._index_node(node_id, text, embedding)
+    
+    def add_edge_to_graph_db(self, source_id: str, target_id: str, rel_type: str, weight: float, metadata: Dict) -> Dict:
+        """Add edge to graph storage and return the stored edge"""
+        with self._write_lock:
+            edge = self._insert_edge(source_id, target_id, rel_type, weight, metadata, datetime.now().isoformat())
+            self._track_edge(edge)
+        return edge
+    
+    def get_node_from_vector_db(self, node_id: str, include_embedding: bool = True):
+        """Get node from vector storage"""
+        row = self.conn.execute(
+            "SELECT text, embedding, embedding_dim, metadata, created_at FROM nodes WHERE id = ?",
+            (node_id,)
+        ).fetchone()
+        
+        return self._node_from_row(row, include_embedding) if row else None
+    
+    def get_nodes_metadata(self, node_ids: List[str]) -> Dict[str, Dict]:
+        """Decoded metadata of just the given nodes, fetched in one query"""
+        if not node_ids:
+            return {}
+        placeholders = ",".join("?" * len(node_ids))
+        cursor = self.conn.execute(
+            f"SELECT id, metadata FROM nodes WHERE id IN ({placeholders})", list(node_ids)
+        )
+        return {node_id: json.loads(metadata) if metadata else {} for node_id, metadata in cursor}
+    
+    def get_all_nodes(self, include_embeddings: bool = True):
+        """Get all nodes from vector storage"""
+        cursor = self.conn.execute(
+            "SELECT id, text, embedding, embedding_dim, metadata, created_at FROM nodes ORDER BY rowid"
+        )
+        
+        return {row[0]: self._node_from_row(row[1:], include_embeddings) for row in cursor}
+    
+    def get_all_edges(self) -> List[Dict]:
+        """Get all edges from graph storage, in insertion order"""
+        return list(self._edges)
+    
+    def stats(self) -> Dict[str, int]:
+        """Node and edge counts, read off the in-memory columns and edge list"""
+        return {"node_count": len(self._node_ids), "edge_count": len(self._edges)}
+    
+    def _load_edges(self) -> List[Dict]:
+        """Read every edge from the edges table, in insertion order"""
+        cursor = self.conn.execute(
+            "SELECT id, source, target, type, weight, metadata, created_at FROM edges ORDER BY seq"
+        )
+        
+        return [
+            {
+                "id": edge_id,
+                "source": source,
+                "target": target,
+                "type": rel_type,
+                "weight": weight,
+                "metadata": json.loads(metadata) if metadata else {},
+                "created_at": created_at
+            }
+            for edge_id, source, target, rel_type, weight, metadata, created_at in cursor
+        ]
+    
+    def get_neighbors_from_graph(self, node_id: str, depth: int = 1):
+        """Get neighboring nodes from graph storage (breadth-first up to depth)
+        
+        Each neighbor carries its text from the in-memory text column, or
+        None when an edge points at an id with no stored node.
+        """
+        neighbors = {}
+        visited = {node_id}
+        queue = deque([(node_id, 0)])
+        
+        while queue:
+            current_id, current_depth = queue.popleft()
+            if current_depth > depth:
+                continue
+            
+            for edge in self._adj.get(current_id, ()):
+                target = edge["target"]
+                if target not in neighbors:
+                    row = self._node_rows.get(target)
+                    neighbors[target] = {
+                        "text": self._node_texts[row] if row is not None else None,
+                        "edges": [],
+                        "depth": current_depth
+                    }
+                neighbors[target]["edges"].append(edge)
+                if target not in visited:
+                    visited.add(target)
+                    queue.append((target, current_depth + 1))
+        
+        return neighbors
+    
+    def _embed_texts(self, texts: List[str]) -> np.ndarray:
+        """Embed a batch of texts in one call (mock random vectors for now)"""
+        return _RNG.random((len(texts), EMBEDDING_DIM), dtype=np.float32)
+    
+    def process_text_file(self, file_path: str, file_name: str) -> int:
+        """Process a text file and create nodes from content"""
+        nodes_created = 0
+        
+        try:
+            # Try multiple encodings
+            content = None
+            encodings = ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252', 'iso-8859-1']
+            
+            for encoding in encodings:
+                try:
+                    with open(file_path, 'r', encoding=encoding) as f:
+                        content = f.read()
+                    break
+                except (UnicodeDecodeError, LookupError):
+                    continue
+            
+            if content is None:
+                # If all encodings fail, read as binary and decode with errors='ignore'
+                with open(file_path, 'rb') as f:
+                    content = f.read().decode('utf-8', errors='ignore')
+            
+            # Split by paragraphs or sentences
+            lines = [line.strip() for line in content.split('\n') if line.strip()]
+            
+            # Collect the lines first so they are embedded in a single batch
+            items = [(i, line) for i, line in enumerate(lines) if len(line) > 10]  # Skip very short lines
+            embeddings = self._embed_texts([line for _, line in items])
+            
+            node_ids = self.new_node_ids(len(items))
+            
+            with self.transaction():
+                for node_id, (i, line), embedding in zip(node_ids, items, embeddings):
+                    metadata = {
+                        "source": "file_upload",
+                        "file_name": file_name,
+                        "line_index": i
+                    }
+                    self.add_node_to_vector_db(node_id, line, embedding, metadata)
+                    nodes_created += 1
+        
+        except Exception as e:
+            print(f"Error processing text file: {e}")
+        
+        return nodes_created
+    
+    def process_json_file(self, file_path: str, file_name: str) -> int:
+        """Process a JSON file and create nodes from content"""
+        nodes_created = 0
+        
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            
+            # Walk the document depth-first in key order with an explicit stack;
+            # each entry carries its string's metadata when it becomes a node
+            items = []
+            stack = [(data, "", None)]
+            while stack:
+                obj, path, location = stack.pop()
+                
+                if isinstance(obj, str):
+                    if location is not None:
+                        items.append((obj, location))
+                    continue
+                
+                if isinstance(obj, dict):
+                    children = []
+                    for key, value in obj.items():
+                        child_path = f"{path}.{key}" if path else key
+                        children.append((value, child_path, {"json_key": child_path}))
+                elif isinstance(obj, list):
+                    children = [(item, f"{path}[{i}]", {"array_index": i}) for i, item in enumerate(obj)]
+                else:
+                    continue
+                
+                for value, child_path, location in reversed(children):
+                    is_node = isinstance(value, str) and len(value) > 10
+                    stack.append((value, child_path, location if is_node else None))
+            
+            embeddings = self._embed_texts([text for text, _ in items])
+            node_ids = self.new_node_ids(len(items))
+            self.bulk_add_nodes([
+                (
+                    node_id,
+                    text,
+                    embedding,
+                    {"source": "file_upload", "file_name": file_name, **location}
+                )
+                for node_id, (text, location), embedding in zip(node_ids, items, embeddings)
+            ])
+            nodes_created = len(items)
+        
+        except Exception as e:
+            print(f"Error processing JSON file: {e}")
+        
+        return nodes_created
+    
+    def process_pdf_file(self, file_path: str, file_name: str) -> int:
+        """Process a PDF file and create nodes from content"""
+        nodes_created = 0
+        
+        try:
+            from PyPDF2 import PdfReader
+            
+            with open(file_path, 'rb') as f, self.transaction():
+                pdf_reader = PdfReader(f)
+                
+                for page_num, page in enumerate(pdf_reader.pages):
+                    text = page.extract_text()
+                    
+                    # Split by paragraphs/lines
+                    lines = [line.strip() for line in text.split('\n') if line.strip()]
+                    
+                    items = [(i, line) for i, line in enumerate(lines) if len(line) > 10]  # Skip very short lines
+                    embeddings = self._embed_texts([line for _, line in items])
+                    
+                    node_ids = self.new_node_ids(len(items))
+                    
+                    for node_id, (i, line), embedding in zip(node_ids, items, embeddings):
+                        metadata = {
+                            "source": "file_upload",
+                            "file_name": file_name,
+                            "page_number": page_num + 1,
+                            "line_index": i
+                        }
+                        self.add_node_to_vector_db(node_id, line, embedding, metadata)
+                        nodes_created += 1
+        
+        except Exception as e:
+            print(f"Error processing PDF file: {e}")
+        
+        return nodes_created
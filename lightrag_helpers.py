@@ -2,7 +2,12 @@
 
 This module wraps imports so it can be imported safely in environments without LightRAG installed.
 """
+import asyncio
+import hashlib
 import os
+import sqlite3
+import threading
+from pathlib import Path
 
 def get_rag_ctor_kwargs_from_env():
     """Return a dict with a few default kwargs for LightRAG constructor (not importing LightRAG itself).
@@ -17,3 +22,125 @@ def get_rag_ctor_kwargs_from_env():
         'neo4j_user': os.environ.get('NEO4J_USERNAME', 'neo4j'),
         'neo4j_password': os.environ.get('NEO4J_PASSWORD', 'password'),
     }
+
+
+EMBED_CACHE_FILE = Path.home() / '.cache' / 'life_raga' / 'embeddings.db'
+# Bump when the way embeddings are produced or post-processed changes, so
+# vectors computed the old way are never served again
+EMBED_CACHE_VERSION = 1
+
+
+def get_embed_batch_size():
+    """Number of texts sent per Ollama /api/embed request (OLLAMA_EMBED_BATCH_SIZE, default 64)."""
+    return max(1, int(os.environ.get('OLLAMA_EMBED_BATCH_SIZE', '64')))
+
+
+async def embed_batch(texts, model=None, host=None, session=None):
+    """Embed many texts with Ollama's batch endpoint, one request per batch of texts.
+
+    Pass a long-lived aiohttp ``session`` to reuse its pooled keep-alive
+    connections; without one a session is opened for this call only.
+    Returns one embedding (list of floats) per input text, in input order.
+    """
+    import aiohttp
+
+    model = model or os.environ.get('EMBEDDING_MODEL', 'nomic-embed-text')
+    host = (host or os.environ.get('OLLAMA_HOST', 'http://localhost:11434')).rstrip('/')
+    batch_size = get_embed_batch_size()
+
+    owns_session = session is None
+    if owns_session:
+        session = aiohttp.ClientSession()
+    embeddings = []
+    try:
+        for start in range(0, len(texts), batch_size):
+            payload = {"model": model, "input": list(texts[start:start + batch_size])}
+            async with session.post(f"{host}/api/embed", json=payload) as resp:
+                resp.raise_for_status()
+                embeddings.extend((await resp.json())["embeddings"])
+    finally:
+        if owns_session:
+            await session.close()
+    return embeddings
+
+
+def embedding_fingerprint(model):
+    """Identify the embedding model and pipeline version a cached vector came from."""
+    return f"{model}\x00v{EMBED_CACHE_VERSION}"
+
+
+def _embed_cache_key(fingerprint, text):
+    data = f"{fingerprint}\x00{text}".encode('utf-8', 'surrogatepass')
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+# One connection per cache file, shared by every call; callers hold
+# _embed_cache_lock while using it, since the work runs in worker threads
+_embed_cache_conns = {}
+_embed_cache_lock = threading.Lock()
+
+
+def _open_embed_cache(cache_file=None):
+    cache_file = Path(cache_file or os.environ.get('EMBED_CACHE_FILE', EMBED_CACHE_FILE))
+    conn = _embed_cache_conns.get(cache_file)
+    if conn is None:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(cache_file, check_same_thread=False)
+        conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+        _embed_cache_conns[cache_file] = conn
+    return conn
+
+
+def _read_embed_cache(cache_file, keys):
+    """Cached vectors (lists of floats) of whichever of ``keys`` are stored."""
+    import numpy as np
+
+    found = {}
+    with _embed_cache_lock:
+        conn = _open_embed_cache(cache_file)
+        for start in range(0, len(keys), 500):
+            part = keys[start:start + 500]
+            rows = conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(part))})", part
+            )
+            found.update((key, np.frombuffer(blob, dtype=np.float32).tolist()) for key, blob in rows)
+    return found
+
+
+def _write_embed_cache(cache_file, rows):
+    """Store (key, float32 vector bytes) rows in one transaction."""
+    with _embed_cache_lock:
+        conn = _open_embed_cache(cache_file)
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows)
+
+
+async def cached_embed_batch(texts, model=None, host=None, cache_file=None, session=None):
+    """embed_batch with a persistent cache keyed on (model fingerprint, text).
+
+    Only texts never embedded before with the same model are sent to Ollama;
+    duplicates within one call are embedded once. Vectors are returned at
+    the float32 precision they are cached at, whether or not they were hits.
+    The cache's SQLite I/O runs in a worker thread, off the event loop.
+    """
+    import numpy as np
+
+    model = model or os.environ.get('EMBEDDING_MODEL', 'nomic-embed-text')
+    fingerprint = embedding_fingerprint(model)
+    keys = [_embed_cache_key(fingerprint, t) for t in texts]
+
+    found = await asyncio.to_thread(_read_embed_cache, cache_file, list(dict.fromkeys(keys)))
+
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in found:
+            missing.setdefault(key, text)
+    if missing:
+        vectors = await embed_batch(list(missing.values()), model=model, host=host, session=session)
+        vectors = [np.asarray(v, dtype=np.float32) for v in vectors]
+        await asyncio.to_thread(
+            _write_embed_cache, cache_file, [(key, v.tobytes()) for key, v in zip(missing, vectors)]
+        )
+        found.update((key, v.tolist()) for key, v in zip(missing, vectors))
+
+    return [found[key] for key in keys]
@@ -4,12 +4,77 @@ Hybrid Database Retrieval System
 Supports 3 modes: Local (Vector), Global (Graph), Hybrid (Both)
 """
 
+import asyncio
+import bisect
+import copy
+import hashlib
+import heapq
+import itertools
 import json
 import math
-import random
-from typing import List, Dict, Any, Optional
+import os
+import sqlite3
+import threading
+from collections import Counter
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import hyperscan
+except ImportError:  # optional: falls back to testing every vocabulary word
+    hyperscan = None
+
+# Width of the (mock) query embeddings
+EMBEDDING_DIM = 768
+# "int8" scores local_search on 8-bit codes of the unit rows (per-row scale),
+# a quarter of the bytes to stream; needs numba, else the float32 scan is used
+EMBEDDING_QUANTIZATION = os.environ.get('EMBEDDING_QUANTIZATION', 'none').lower()
+_INT8_SCAN = EMBEDDING_QUANTIZATION == "int8" and njit is not None
+
+def _quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 codes and scales, so vectors ~= codes * scales[:, None]"""
+    vectors = np.atleast_2d(vectors)
+    scales = (np.abs(vectors).max(axis=1) / 127).astype(np.float32)
+    codes = np.rint(vectors / np.where(scales > 0, scales, 1)[:, None]).astype(np.int8)
+    return codes, scales
+
+if njit is not None:
+    @njit(cache=True, nogil=True)
+    def _int8_dots_nb(codes, query_codes):
+        # int8 products summed in int32 (NumPy's int8 matmul would overflow
+        # and has no BLAS path); LLVM widens and vectorizes the inner loop
+        out = np.empty(codes.shape[0], dtype=np.int32)
+        for i in range(codes.shape[0]):
+            acc = np.int32(0)
+            for j in range(EMBEDDING_DIM):
+                acc += np.int32(codes[i, j]) * np.int32(query_codes[j])
+            out[i] = acc
+        return out
+    
+    @njit(cache=True, nogil=True, fastmath=True)
+    def _cosine_nb(v1, v2):
+        # Same contract as the pure-Python _cosine_similarity: the dot product
+        # runs over the shorter vector, each magnitude over its whole vector
+        dot_product = 0.0
+        for i in range(min(v1.size, v2.size)):
+            dot_product += v1[i] * v2[i]
+        magnitude1 = 0.0
+        for a in v1:
+            magnitude1 += a * a
+        magnitude2 = 0.0
+        for b in v2:
+            magnitude2 += b * b
+        if magnitude1 == 0.0 or magnitude2 == 0.0:
+            return 0.0
+        return dot_product / (math.sqrt(magnitude1) * math.sqrt(magnitude2))
 
 # ============================================================================
 # DATA MODELS FOR RETRIEVAL
@@ -35,6 +100,37 @@ class RetrievalResult:
     latency_ms: float
     metadata: Dict[str, Any]
 
+@dataclass(frozen=True)
+class _StoreSnapshot:
+    """
+    One committed version of the store: the nodes as columns (struct of
+    arrays, one row per node; rows are addressed by index throughout) and
+    the text and graph indexes built from them. _load_store builds it whole
+    and never modifies it, so a search that takes one snapshot reads a
+    single consistent store however many reloads happen meanwhile.
+    """
+    data_version: int
+    node_ids: List[str]
+    node_rows: Dict[str, int]
+    texts: List[str]
+    metadatas: List[Dict[str, Any]]
+    matrix: np.ndarray
+    matrix_rows: np.ndarray
+    matrix_norms: np.ndarray
+    q8_codes: np.ndarray
+    q8_scales: np.ndarray
+    other_rows: List[int]
+    other_embeddings: List[Any]
+    token_sets: List[frozenset]
+    vocab: List[str]
+    vocab_rows: List[List[int]]
+    vocab_blob: bytes
+    vocab_ends: List[int]
+    degree_map: Counter
+    adjacency: Dict[str, List[Dict]]
+    # Memo of _token_rows; derived from vocab and vocab_rows only
+    token_rows_cache: Dict[str, frozenset] = field(default_factory=dict)
+
 # ============================================================================
 # RETRIEVAL ENGINE
 # ============================================================================
@@ -47,16 +143,25 @@ class HybridRetrievalEngine:
     - Hybrid (Vector + Graph) search
     """
     
-    def __init__(self, vector_store_path: str, graph_store_path: str):
-        self.vector_store_path = vector_store_path
-        self.graph_store_path = graph_store_path
-        self.stats = {
-            "total_queries": 0,
-            "local_queries": 0,
-            "global_queries": 0,
-            "hybrid_queries": 0,
-            "avg_latency_ms": 0.0
-        }
+    def __init__(self, db_path: str = "./rag_local/hybrid_store.db"):
+        # The SQLite store hybrid_db_api writes nodes and edges to
+        self.db_path = db_path
+        # Query counts per mode and the running mean latency
+        self.query_counts: Counter = Counter()
+        self.total_queries = 0
+        self.avg_latency_ms = 0.0
+        # Read-only connection to the store, opened on first use, and the
+        # snapshot of it searches read; _load_lock serializes reloads, which
+        # may run in worker threads
+        self._conn: Optional[sqlite3.Connection] = None
+        self._store: Optional[_StoreSnapshot] = None
+        self._load_lock = threading.Lock()
+        # Search results keyed by (mode, query, parameters); emptied whenever
+        # a store is reloaded, oldest entries evicted first
+        self._result_cache: Dict[Tuple, Dict[str, Any]] = {}
+        self._result_cache_size = 256
+        # Mock query embeddings by query text, same size cap
+        self._query_vectors: Dict[str, np.ndarray] = {}
     
     # ====================================================================
     # VECTOR SEARCH (LOCAL MODE)
@@ -67,35 +172,44 @@ class HybridRetrievalEngine:
         Vector-only search using ChromaDB-like embeddings.
         Pure semantic similarity.
         """
+        return self._cached_search(
+            ("local", query_text, top_k),
+            lambda store: self._local_search_impl(query_text, self._embed_query(query_text), top_k, store)
+        )
+    
+    def _local_search_impl(
+        self,
+        query_text: str,
+        query_embedding: np.ndarray,
+        top_k: int,
+        store: Optional[_StoreSnapshot] = None
+    ) -> Dict[str, Any]:
+        """
+        local_search on an already embedded query, against the given store
+        snapshot (the current one if None).
+        """
         import time
         start_time = time.time()
         
         try:
-            with open(self.vector_store_path, 'r') as f:
-                data = json.load(f)
+            if store is None:
+                store = self._load_store()
             
-            # Generate query embedding (mock - would use real embeddings)
-            query_embedding = [random.random() for _ in range(768)]
+            # Calculate similarity scores for the whole corpus at once
+            similarities = self._corpus_similarities(query_embedding, store)
             
-            # Calculate similarity scores
-            results = []
-            for node_id, node_data in data["nodes"].items():
-                similarity = self._cosine_similarity(
-                    query_embedding, 
-                    node_data["embedding"]
-                )
-                results.append({
-                    "node_id": node_id,
-                    "text": node_data["text"],
-                    "similarity_score": similarity,
+            # Get top_k without sorting every score
+            top_results = []
+            for row in self._top_k_indices(similarities, top_k):
+                top_results.append({
+                    "node_id": store.node_ids[row],
+                    "text": store.texts[row],
+                    "similarity_score": float(similarities[row]),
                     "source": "vector_db",
-                    "metadata": node_data["metadata"]
+                    # A copy, so callers can't mutate the stored metadata
+                    "metadata": copy.deepcopy(store.metadatas[row])
                 })
             
-            # Sort by similarity and get top_k
-            results.sort(key=lambda x: x["similarity_score"], reverse=True)
-            top_results = results[:top_k]
-            
             # Calculate confidence from scores
             confidence = sum(r["similarity_score"] for r in top_results) / len(top_results) if top_results else 0
             
@@ -105,7 +219,7 @@ class HybridRetrievalEngine:
                 "mode": "local",
                 "query": query_text,
                 "results": top_results,
-                "total_found": len(results),
+                "total_found": len(store.node_ids),
                 "confidence": confidence,
                 "latency_ms": latency
             }
@@ -126,59 +240,72 @@ class HybridRetrievalEngine:
         Graph-only search using Neo4j-like relationships.
         Entity-based reasoning with graph traversal.
         """
+        return self._cached_search(
+            ("global", query_text, depth),
+            lambda store: self._global_search_impl(query_text, self._query_tokens(query_text), depth, store)
+        )
+    
+    def _global_search_impl(
+        self,
+        query_text: str,
+        query_tokens: List[str],
+        depth: int,
+        store: Optional[_StoreSnapshot] = None
+    ) -> Dict[str, Any]:
+        """global_search on an already tokenized query (store as in _local_search_impl)"""
         import time
         start_time = time.time()
         
         try:
-            with open(self.graph_store_path, 'r') as f:
-                graph_data = json.load(f)
-            
-            with open(self.vector_store_path, 'r') as f:
-                vector_data = json.load(f)
+            if store is None:
+                store = self._load_store()
             
             # Find entities mentioned in query
-            query_tokens = query_text.lower().split()
-            matching_nodes = []
+            # Simple keyword matching (would use NLP in production): count
+            # the query tokens found in each node's text, via the word index
+            hits = Counter()
+            for rows in self._token_rows(query_tokens, store):
+                hits.update(rows)
             
-            for node_id, node_data in vector_data["nodes"].items():
-                node_text_lower = node_data["text"].lower()
-                # Simple keyword matching (would use NLP in production)
-                matches = sum(1 for token in query_tokens if token in node_text_lower)
-                if matches > 0:
-                    matching_nodes.append({
-                        "node_id": node_id,
-                        "text": node_data["text"],
-                        "relevance": matches / len(query_tokens),
-                        "degree": self._get_node_degree(node_id, graph_data)
-                    })
+            matching_nodes = []
+            for row in sorted(hits):
+                node_id = store.node_ids[row]
+                matching_nodes.append({
+                    "node_id": node_id,
+                    "text": store.texts[row],
+                    "relevance": hits[row] / len(query_tokens),
+                    "degree": store.degree_map[node_id]
+                })
             
             # Traverse graph from matching nodes
-            reachable_nodes = self._graph_traversal(matching_nodes, graph_data, vector_data, depth)
+            reachable_nodes = self._graph_traversal(matching_nodes, depth, store)
             
             # Rank by relevance and connectivity
             for node in reachable_nodes:
                 node["score"] = node.get("relevance", 0.5) + (node.get("degree", 0) * 0.1)
             
-            reachable_nodes.sort(key=lambda x: x["score"], reverse=True)
+            # Only the top 5 are used, so select them instead of sorting all
+            top_nodes = heapq.nlargest(5, reachable_nodes, key=lambda x: x["score"])
             
-            # Extract relationships
-            relationships = []
-            for edge in graph_data["edges"]:
-                if any(n["node_id"] == edge["source"] for n in reachable_nodes[:5]):
-                    relationships.append({
-                        "source": edge["source"],
-                        "target": edge["target"],
-                        "type": edge["type"],
-                        "weight": edge["weight"]
-                    })
+            # Extract relationships: outgoing edges of the top entities, by rank
+            relationships = [
+                {
+                    "source": edge["source"],
+                    "target": edge["target"],
+                    "type": edge["type"],
+                    "weight": edge["weight"]
+                }
+                for node in top_nodes
+                for edge in store.adjacency.get(node["node_id"], ())
+            ]
             
             latency = (time.time() - start_time) * 1000
-            confidence = sum(n["score"] for n in reachable_nodes[:3]) / 3 if reachable_nodes else 0
+            confidence = sum(n["score"] for n in top_nodes[:3]) / 3 if top_nodes else 0
             
             return {
                 "mode": "global",
                 "query": query_text,
-                "entities": reachable_nodes[:5],
+                "entities": top_nodes,
                 "relationships": relationships,
                 "total_reachable": len(reachable_nodes),
                 "confidence": min(confidence, 1.0),
@@ -209,87 +336,102 @@ class HybridRetrievalEngine:
         Hybrid search combining vector and graph retrieval.
         Fuses both signals for best accuracy.
         """
+        return self._cached_search(
+            ("hybrid", query_text, top_k, vector_weight, graph_weight, do_rerank),
+            lambda store: self._hybrid_search_impl(
+                query_text, top_k, vector_weight, graph_weight, do_rerank, store
+            )
+        )
+    
+    async def ahybrid_search(
+        self, 
+        query_text: str, 
+        top_k: int = 5,
+        vector_weight: float = 0.6,
+        graph_weight: float = 0.4,
+        do_rerank: bool = False
+    ) -> Dict[str, Any]:
+        """
+        hybrid_search for async callers: the vector and graph legs run
+        concurrently in worker threads, without blocking the event loop.
+        """
         import time
         start_time = time.time()
         
+        key = ("hybrid", query_text, top_k, vector_weight, graph_weight, do_rerank)
+        
         try:
-            # 1. Get vector search results
-            vector_results = self.local_search(query_text, top_k)
-            
-            # 2. Get graph search results
-            graph_results = self.global_search(query_text, depth=2)
-            
-            # 3. Combine and score
-            combined_scores = {}
-            
-            # Add vector scores
-            for result in vector_results.get("results", []):
-                node_id = result["node_id"]
-                combined_scores[node_id] = {
-                    "text": result["text"],
-                    "vector_score": result["similarity_score"],
-                    "graph_score": 0.0,
-                    "source": "vector",
-                    "metadata": result.get("metadata", {})
-                }
+            # Reloading reads both tables, so it runs in a worker thread too.
+            # Both legs and the fusion then use this one snapshot, whatever
+            # other calls reload in the meantime
+            store = await asyncio.to_thread(self._load_store)
+        except Exception as e:
+            return {
+                "mode": "hybrid",
+                "error": str(e),
+                "results": []
+            }
+        
+        cached = self._cache_get(key, start_time)
+        if cached is not None:
+            return cached
+        
+        try:
+            # Embed and tokenize the query once for both legs
+            query_embedding = self._embed_query(query_text)
+            query_tokens = self._query_tokens(query_text)
             
-            # Add/merge graph scores
-            for entity in graph_results.get("entities", []):
-                node_id = entity["node_id"]
-                if node_id not in combined_scores:
-                    combined_scores[node_id] = {
-                        "text": entity["text"],
-                        "vector_score": 0.0,
-                        "source": "graph",
-                        "metadata": {}
-                    }
-                combined_scores[node_id]["graph_score"] = entity["score"]
+            # 1. + 2. Vector and graph search at the same time
+            vector_results, graph_results = await asyncio.gather(
+                asyncio.to_thread(self._local_search_impl, query_text, query_embedding, top_k, store),
+                asyncio.to_thread(self._global_search_impl, query_text, query_tokens, 2, store)
+            )
             
-            # 4. Calculate hybrid scores
-            hybrid_results = []
-            for node_id, scores in combined_scores.items():
-                hybrid_score = (
-                    scores["vector_score"] * vector_weight +
-                    scores["graph_score"] * graph_weight
-                )
-                hybrid_results.append({
-                    "node_id": node_id,
-                    "text": scores["text"],
-                    "vector_score": scores["vector_score"],
-                    "graph_score": scores["graph_score"],
-                    "hybrid_score": hybrid_score,
-                    "source": "hybrid",
-                    "metadata": scores.get("metadata", {})
-                })
+            result = self._fuse_results(
+                query_text, vector_results, graph_results,
+                top_k, vector_weight, graph_weight, do_rerank, start_time, store
+            )
+        except Exception as e:
+            return {
+                "mode": "hybrid",
+                "error": str(e),
+                "results": []
+            }
+        
+        self._cache_put(key, result, store)
+        return result
+    
+    def _hybrid_search_impl(
+        self,
+        query_text: str,
+        top_k: int,
+        vector_weight: float,
+        graph_weight: float,
+        do_rerank: bool,
+        store: Optional[_StoreSnapshot] = None
+    ) -> Dict[str, Any]:
+        """hybrid_search without the result cache (store as in _local_search_impl)"""
+        import time
+        start_time = time.time()
+        
+        try:
+            if store is None:
+                store = self._load_store()
             
-            # 5. Sort and rerank if requested
-            hybrid_results.sort(key=lambda x: x["hybrid_score"], reverse=True)
+            # Embed and tokenize the query once for both legs
+            query_embedding = self._embed_query(query_text)
+            query_tokens = self._query_tokens(query_text)
             
-            if do_rerank:
-                hybrid_results = self._rerank_results(hybrid_results, query_text)
+            # 1. Get vector search results
+            vector_results = self._local_search_impl(query_text, query_embedding, top_k, store)
             
-            # Get top_k
-            final_results = hybrid_results[:top_k]
+            # 2. Get graph search results
+            graph_results = self._global_search_impl(query_text, query_tokens, 2, store)
             
-            # Calculate confidence
-            confidence = (
-                sum(r["hybrid_score"] for r in final_results) / len(final_results)
-                if final_results else 0
+            return self._fuse_results(
+                query_text, vector_results, graph_results,
+                top_k, vector_weight, graph_weight, do_rerank, start_time, store
             )
-            
-            latency = (time.time() - start_time) * 1000
-            
-            return {
-                "mode": "hybrid",
-                "query": query_text,
-                "results": final_results,
-                "total_candidates": len(hybrid_results),
-                "vector_weight": vector_weight,
-                "graph_weight": graph_weight,
-                "confidence": confidence,
-                "latency_ms": latency,
-                "relationships": graph_results.get("relationships", [])
-            }
         
         except Exception as e:
             return {
@@ -298,13 +440,379 @@ class HybridRetrievalEngine:
                 "results": []
             }
     
+    def _fuse_results(
+        self,
+        query_text: str,
+        vector_results: Dict[str, Any],
+        graph_results: Dict[str, Any],
+        top_k: int,
+        vector_weight: float,
+        graph_weight: float,
+        do_rerank: bool,
+        start_time: float,
+        store: _StoreSnapshot
+    ) -> Dict[str, Any]:
+        """Combine the vector and graph legs (both run on store) into the hybrid result"""
+        import time
+        
+        # 3. Combine and score
+        combined_scores = {}
+        
+        # Add vector scores
+        for result in vector_results.get("results", []):
+            node_id = result["node_id"]
+            combined_scores[node_id] = {
+                "text": result["text"],
+                "vector_score": result["similarity_score"],
+                "graph_score": 0.0,
+                "source": "vector",
+                "metadata": result.get("metadata", {})
+            }
+        
+        # Add/merge graph scores
+        for entity in graph_results.get("entities", []):
+            node_id = entity["node_id"]
+            if node_id not in combined_scores:
+                combined_scores[node_id] = {
+                    "text": entity["text"],
+                    "vector_score": 0.0,
+                    "source": "graph",
+                    "metadata": {}
+                }
+            combined_scores[node_id]["graph_score"] = entity["score"]
+        
+        # 4. Calculate hybrid scores
+        hybrid_results = []
+        for node_id, scores in combined_scores.items():
+            hybrid_score = (
+                scores["vector_score"] * vector_weight +
+                scores["graph_score"] * graph_weight
+            )
+            hybrid_results.append({
+                "node_id": node_id,
+                "text": scores["text"],
+                "vector_score": scores["vector_score"],
+                "graph_score": scores["graph_score"],
+                "hybrid_score": hybrid_score,
+                "source": "hybrid",
+                "metadata": scores.get("metadata", {})
+            })
+        
+        # 5. Get top_k, reranked if requested, without sorting every candidate
+        if do_rerank:
+            final_results = self._rerank_results(hybrid_results, query_text, top_k, store)
+        else:
+            final_results = heapq.nlargest(top_k, hybrid_results, key=lambda x: x["hybrid_score"])
+        
+        # Calculate confidence
+        confidence = (
+            sum(r["hybrid_score"] for r in final_results) / len(final_results)
+            if final_results else 0
+        )
+        
+        latency = (time.time() - start_time) * 1000
+        
+        return {
+            "mode": "hybrid",
+            "query": query_text,
+            "results": final_results,
+            "total_candidates": len(hybrid_results),
+            "vector_weight": vector_weight,
+            "graph_weight": graph_weight,
+            "confidence": confidence,
+            "latency_ms": latency,
+            "relationships": graph_results.get("relationships", [])
+        }
+    
     # ====================================================================
     # HELPER METHODS
     # ====================================================================
     
+    def _cached_search(self, key: Tuple, search) -> Dict[str, Any]:
+        """
+        Cached result for key, or run search(store) on the current store
+        snapshot and cache its result. Callers always get a copy, so they
+        can't mutate cache entries.
+        """
+        import time
+        start_time = time.time()
+        
+        try:
+            # Reloading a changed store also empties the cache
+            store = self._load_store()
+        except Exception:
+            # Let the search itself report the error
+            return search(None)
+        
+        cached = self._cache_get(key, start_time)
+        if cached is not None:
+            return cached
+        
+        result = search(store)
+        self._cache_put(key, result, store)
+        return result
+    
+    def _cache_get(self, key: Tuple, start_time: float) -> Optional[Dict[str, Any]]:
+        """Copy of the cached result for key (with its own latency), or None"""
+        import time
+        
+        cached = self._result_cache.get(key)
+        if cached is None:
+            return None
+        result = copy.deepcopy(cached)
+        result["latency_ms"] = (time.time() - start_time) * 1000
+        return result
+    
+    def _cache_put(self, key: Tuple, result: Dict[str, Any], store: _StoreSnapshot):
+        """
+        Cache a copy of result, computed on store, unless it is an error or
+        store has been replaced since: the reload that replaced it already
+        emptied the cache, and nothing would evict a result from older data.
+        """
+        if "error" not in result and store is self._store:
+            if len(self._result_cache) >= self._result_cache_size:
+                self._result_cache.pop(next(iter(self._result_cache)), None)
+            self._result_cache[key] = copy.deepcopy(result)
+    
+    def _embed_query(self, query_text: str) -> np.ndarray:
+        """
+        Query embedding (mock - would use real embeddings). Seeded from a
+        digest of the text, so the same query always gets the same vector.
+        """
+        query_embedding = self._query_vectors.get(query_text)
+        if query_embedding is None:
+            seed = int.from_bytes(hashlib.blake2b(query_text.encode('utf-8', 'surrogatepass'), digest_size=8).digest(), 'little')
+            query_embedding = np.random.default_rng(seed).random(EMBEDDING_DIM, dtype=np.float32)
+            query_embedding.setflags(write=False)
+            if len(self._query_vectors) >= self._result_cache_size:
+                self._query_vectors.pop(next(iter(self._query_vectors)), None)
+            self._query_vectors[query_text] = query_embedding
+        return query_embedding
+    
+    @staticmethod
+    def _query_tokens(query_text: str) -> List[str]:
+        """Lowercased query words for keyword matching"""
+        return query_text.lower().split()
+    
+    def _load_store(self) -> _StoreSnapshot:
+        """
+        Snapshot of the SQLite store, rebuilt only after a write has been
+        committed. A new snapshot replaces the old one in one assignment;
+        searches that took the old one keep reading it unchanged.
+        """
+        with self._load_lock:
+            if self._conn is None:
+                # Read-only, so a missing store is an error rather than a new empty file
+                self._conn = sqlite3.connect(
+                    f"file:{self.db_path}?mode=ro", uri=True,
+                    isolation_level=None, check_same_thread=False
+                )
+            # data_version changes whenever another connection commits; one that
+            # lands after this read just triggers another reload next time
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if self._store is None or version != self._store.data_version:
+                # One read transaction, so nodes and edges come from the same snapshot
+                self._conn.execute("BEGIN")
+                try:
+                    nodes = self._conn.execute(
+                        "SELECT id, text, embedding, embedding_dim, metadata FROM nodes ORDER BY rowid"
+                    ).fetchall()
+                    edges = [
+                        {"source": source, "target": target, "type": rel_type, "weight": weight}
+                        for source, target, rel_type, weight in self._conn.execute(
+                            "SELECT source, target, type, weight FROM edges ORDER BY seq"
+                        )
+                    ]
+                finally:
+                    self._conn.execute("COMMIT")
+                columns = self._index_vectors(nodes)
+                columns.update(self._index_text(columns["texts"]))
+                columns.update(self._index_graph(edges))
+                self._store = _StoreSnapshot(data_version=version, **columns)
+                self._result_cache.clear()
+            return self._store
+    
+    def _index_vectors(self, nodes: List[Tuple]) -> Dict[str, Any]:
+        """
+        Convert the stored (id, text, embedding, embedding_dim, metadata)
+        rows into columns in one pass: ids, texts and metadata lists, and
+        every EMBEDDING_DIM-wide embedding stacked into one float32 matrix.
+        Returns them as _StoreSnapshot fields.
+        """
+        node_ids = []
+        texts = []
+        metadatas = []
+        rows, blobs = [], []
+        other_rows, other_embeddings = [], []
+        for row, (node_id, text, blob, embedding_dim, metadata) in enumerate(nodes):
+            node_ids.append(node_id)
+            texts.append(text)
+            metadatas.append(json.loads(metadata) if metadata else {})
+            if embedding_dim == EMBEDDING_DIM and blob is not None:
+                rows.append(row)
+                blobs.append(blob)
+            else:
+                # Nodes of any other width fall back to the scalar helper,
+                # which takes float64 arrays when numba is there
+                other_rows.append(row)
+                embedding = np.frombuffer(blob or b"", dtype=np.float32).astype(np.float64)
+                other_embeddings.append(embedding if njit is not None else embedding.tolist())
+        # Blobs are raw float32, so joined they are the matrix
+        matrix = np.frombuffer(b"".join(blobs), dtype=np.float32).reshape(len(rows), EMBEDDING_DIM)
+        matrix_norms = np.linalg.norm(matrix, axis=1)
+        if _INT8_SCAN:
+            # Codes of the unit rows, so a score is just dots * scales
+            unit = matrix / np.where(matrix_norms > 0, matrix_norms, 1)[:, None]
+            q8_codes, q8_scales = _quantize_int8(unit)
+        else:
+            q8_codes = np.zeros((0, EMBEDDING_DIM), dtype=np.int8)
+            q8_scales = np.zeros(0, dtype=np.float32)
+        
+        return {
+            "node_ids": node_ids,
+            "node_rows": {node_id: row for row, node_id in enumerate(node_ids)},
+            "texts": texts,
+            "metadatas": metadatas,
+            "matrix": matrix,
+            "matrix_rows": np.array(rows, dtype=np.intp),
+            "matrix_norms": matrix_norms,
+            "q8_codes": q8_codes,
+            "q8_scales": q8_scales,
+            "other_rows": other_rows,
+            "other_embeddings": other_embeddings,
+        }
+    
+    def _index_text(self, texts: List[str]) -> Dict[str, Any]:
+        """
+        Tokenize every node's text once: token sets for the rerank overlap,
+        and an inverted index word -> rows (in node order) for keyword matching.
+        Returns them as _StoreSnapshot fields.
+        """
+        token_sets = [frozenset(text.lower().split()) for text in texts]
+        word_rows: Dict[str, List[int]] = {}
+        for row, tokens in enumerate(token_sets):
+            for word in tokens:
+                word_rows.setdefault(word, []).append(row)
+        vocab = list(word_rows)
+        
+        vocab_blob, vocab_ends = b"", []
+        if hyperscan is not None:
+            # Newline-separated vocabulary for one Hyperscan pass per query;
+            # a match ending at byte e belongs to the first word ending at >= e
+            vocab_blob = "\n".join(vocab).encode("utf-8")
+            offset = 0
+            for word in vocab:
+                offset += len(word.encode("utf-8"))
+                vocab_ends.append(offset)
+                offset += 1
+        
+        return {
+            "token_sets": token_sets,
+            "vocab": vocab,
+            "vocab_rows": list(word_rows.values()),
+            "vocab_blob": vocab_blob,
+            "vocab_ends": vocab_ends,
+        }
+    
+    def _token_rows(self, tokens: List[str], store: _StoreSnapshot) -> List[frozenset]:
+        """
+        For each token, the rows whose lowercased text contains it as a substring.
+        A token has no whitespace, so any occurrence lies inside one word:
+        scanning the vocabulary finds exactly the nodes a full-text scan would.
+        """
+        cache = store.token_rows_cache
+        found = {token: cache.get(token) for token in tokens}
+        missing = [token for token, rows in found.items() if rows is None]
+        if missing:
+            for token, word_ids in zip(missing, self._match_vocabulary(missing, store)):
+                found[token] = frozenset(
+                    row for word_id in word_ids for row in store.vocab_rows[word_id]
+                )
+                if len(cache) >= 4096:
+                    cache.clear()
+                cache[token] = found[token]
+        return [found[token] for token in tokens]
+    
+    def _match_vocabulary(self, tokens: List[str], store: _StoreSnapshot) -> List[set]:
+        """Indices of the vocabulary words containing each token"""
+        matched = [set() for _ in tokens]
+        if hyperscan is not None:
+            def on_match(token_id, start, end, flags, context):
+                matched[token_id].add(bisect.bisect_left(store.vocab_ends, end))
+            
+            try:
+                # All tokens as literals in one database, one scan of the vocabulary
+                db = hyperscan.Database()
+                db.compile(
+                    expressions=[token.encode("utf-8") for token in tokens],
+                    ids=list(range(len(tokens))),
+                    elements=len(tokens),
+                    flags=0,
+                    literal=True,
+                )
+                db.scan(store.vocab_blob, match_event_handler=on_match)
+                return matched
+            except Exception:
+                matched = [set() for _ in tokens]
+        
+        for word_id, word in enumerate(store.vocab):
+            for token_id, token in enumerate(tokens):
+                if token in word:
+                    matched[token_id].add(word_id)
+        return matched
+    
+    def _corpus_similarities(self, query_embedding: np.ndarray, store: _StoreSnapshot) -> np.ndarray:
+        """
+        Cosine similarity of the query against every node, in one matrix product.
+        Returns a score per row, in store.node_ids order.
+        """
+        similarities = np.zeros(len(store.node_ids), dtype=np.float32)
+        fallback = zip(store.other_rows, store.other_embeddings)
+        
+        if len(query_embedding) == EMBEDDING_DIM:
+            query = np.asarray(query_embedding, dtype=np.float32)
+            query_norm = np.linalg.norm(query)
+            if _INT8_SCAN:
+                # About 1e-3 absolute error against the float32 scores
+                codes, scales = _quantize_int8(query / (query_norm or 1))
+                dots = _int8_dots_nb(store.q8_codes, codes[0])
+                similarities[store.matrix_rows] = dots * (store.q8_scales * scales[0])
+            else:
+                denominators = store.matrix_norms * query_norm
+                dots = store.matrix @ query
+                similarities[store.matrix_rows] = np.divide(
+                    dots, denominators, out=np.zeros_like(dots), where=denominators > 0
+                )
+        else:
+            fallback = itertools.chain(zip(store.matrix_rows, store.matrix), fallback)
+        if njit is not None:
+            # Convert the query once rather than on every fallback call
+            query_embedding = np.asarray(query_embedding, dtype=np.float64)
+        for row, embedding in fallback:
+            similarities[row] = self._cosine_similarity(query_embedding, embedding)
+        
+        return similarities
+    
+    @staticmethod
+    def _top_k_indices(scores: np.ndarray, top_k: int) -> List[int]:
+        """Indices of the top_k highest scores, best first (equal scores in input order)"""
+        n = len(scores)
+        k = min(top_k, n)
+        if k <= 0:
+            return []
+        # Partition the scores in place of a negated O(N) copy, then order
+        # only the k survivors; sorting them by index first makes the
+        # stable sort keep input order among equal scores
+        top = np.argpartition(scores, n - k)[n - k:]
+        top.sort()
+        return top[np.argsort(-scores[top], kind="stable")].tolist()
+    
     @staticmethod
     def _cosine_similarity(v1: List[float], v2: List[float]) -> float:
-        """Calculate cosine similarity between two vectors"""
+        """Calculate cosine similarity between two vectors (JIT-compiled with numba)"""
+        if njit is not None:
+            return _cosine_nb(np.asarray(v1, dtype=np.float64), np.asarray(v2, dtype=np.float64))
+        
         dot_product = sum(a * b for a, b in zip(v1, v2))
         magnitude1 = math.sqrt(sum(a ** 2 for a in v1))
         magnitude2 = math.sqrt(sum(b ** 2 for b in v2))
@@ -314,88 +822,124 @@ class HybridRetrievalEngine:
         
         return dot_product / (magnitude1 * magnitude2)
     
-    def _get_node_degree(self, node_id: str, graph_data: Dict) -> int:
-        """Get connectivity degree of a node in the graph"""
-        degree = 0
-        for edge in graph_data["edges"]:
-            if edge["source"] == node_id or edge["target"] == node_id:
-                degree += 1
-        return degree
+    def _index_graph(self, edges: List[Dict]) -> Dict[str, Any]:
+        """
+        Index the edges in one pass: degree per node and outgoing edges
+        per source, so lookups don't rescan every edge. Returns them as
+        _StoreSnapshot fields.
+        """
+        degree_map = Counter()
+        adjacency: Dict[str, List[Dict]] = {}
+        for edge in edges:
+            degree_map[edge["source"]] += 1
+            # A self-loop touches its node once
+            if edge["target"] != edge["source"]:
+                degree_map[edge["target"]] += 1
+            adjacency.setdefault(edge["source"], []).append(edge)
+        
+        return {"degree_map": degree_map, "adjacency": adjacency}
     
     def _graph_traversal(
         self, 
         start_nodes: List[Dict], 
-        graph_data: Dict, 
-        vector_data: Dict,
-        depth: int
+        depth: int,
+        store: _StoreSnapshot
     ) -> List[Dict[str, Any]]:
-        """Traverse graph from start nodes up to specified depth"""
+        """
+        Breadth-first traversal from the start nodes up to the given depth.
+        Each node is expanded once, at the shallowest depth it is reached.
+        Works a whole frontier at a time, so a graph backend answers one
+        batched degree and expansion lookup per level, not one per node.
+        """
+        node_rows = store.node_rows
         visited = set()
-        reachable = []
+        frontier = []
+        for start_node in start_nodes:
+            if start_node["node_id"] not in visited:
+                visited.add(start_node["node_id"])
+                frontier.append(start_node["node_id"])
         
-        def traverse(node_id: str, current_depth: int):
-            if current_depth > depth or node_id in visited:
-                return
+        reachable = []
+        for current_depth in range(depth + 1):
+            if not frontier:
+                break
             
-            visited.add(node_id)
+            # Add this level's nodes
+            degrees = self._batch_degree(frontier, store)
+            for node_id in frontier:
+                if node_id in node_rows:
+                    reachable.append({
+                        "node_id": node_id,
+                        "text": store.texts[node_rows[node_id]],
+                        "depth": current_depth,
+                        "relevance": 1.0 / (current_depth + 1),
+                        "degree": degrees[node_id]
+                    })
             
-            # Add this node
-            if node_id in vector_data["nodes"]:
-                node_data = vector_data["nodes"][node_id]
-                reachable.append({
-                    "node_id": node_id,
-                    "text": node_data["text"],
-                    "depth": current_depth,
-                    "relevance": 1.0 / (current_depth + 1),
-                    "degree": self._get_node_degree(node_id, graph_data)
-                })
+            if current_depth == depth:
+                break
             
-            # Traverse to neighbors
-            for edge in graph_data["edges"]:
-                if edge["source"] == node_id:
-                    traverse(edge["target"], current_depth + 1)
-        
-        for start_node in start_nodes:
-            traverse(start_node["node_id"], 0)
+            # Unseen neighbors form the next level
+            out_edges = self._batch_expand(frontier, store)
+            next_frontier = []
+            for node_id in frontier:
+                for edge in out_edges[node_id]:
+                    if edge["target"] not in visited:
+                        visited.add(edge["target"])
+                        next_frontier.append(edge["target"])
+            frontier = next_frontier
         
         return reachable
     
+    def _batch_degree(self, node_ids: List[str], store: _StoreSnapshot) -> Dict[str, int]:
+        """Degree of each node, in one lookup for the whole batch"""
+        return {node_id: store.degree_map[node_id] for node_id in node_ids}
+    
+    def _batch_expand(self, node_ids: List[str], store: _StoreSnapshot) -> Dict[str, List[Dict]]:
+        """Outgoing edges of each node, in one lookup for the whole batch"""
+        return {node_id: store.adjacency.get(node_id, []) for node_id in node_ids}
+    
     def _rerank_results(
         self, 
         results: List[Dict], 
-        query_text: str
+        query_text: str,
+        top_k: int,
+        store: _StoreSnapshot
     ) -> List[Dict]:
         """
-        Rerank results using semantic relevance.
+        Rerank results using semantic relevance and return the top_k.
         (In production, would use BAAI bge-reranker)
         """
-        query_tokens = set(query_text.lower().split())
+        query_tokens = frozenset(query_text.lower().split())
         
         for result in results:
-            text_tokens = set(result["text"].lower().split())
-            overlap = len(query_tokens & text_tokens) / len(query_tokens | text_tokens)
+            row = store.node_rows.get(result["node_id"])
+            if row is not None:
+                text_tokens = store.token_sets[row]
+            else:
+                text_tokens = frozenset(result["text"].lower().split())
+            overlap = len(query_tokens & text_tokens) / max(1, len(query_tokens | text_tokens))
             result["rerank_score"] = result["hybrid_score"] * (0.7 + 0.3 * overlap)
         
-        results.sort(key=lambda x: x["rerank_score"], reverse=True)
-        return results
+        # Ties fall back to the hybrid score, then to candidate order
+        return heapq.nlargest(top_k, results, key=lambda x: (x["rerank_score"], x["hybrid_score"]))
     
     def update_stats(self, mode: str, latency: float):
         """Update retrieval statistics"""
-        self.stats["total_queries"] += 1
-        self.stats[f"{mode}_queries"] += 1
+        self.total_queries += 1
+        self.query_counts[mode] += 1
         
-        # Update average latency
-        total_latency = self.stats["avg_latency_ms"] * (self.stats["total_queries"] - 1)
-        self.stats["avg_latency_ms"] = (total_latency + latency) / self.stats["total_queries"]
+        # Update average latency (incremental mean, no running total to rescale)
+        self.avg_latency_ms += (latency - self.avg_latency_ms) / self.total_queries
     
     def get_stats(self) -> Dict[str, Any]:
         """Get retrieval statistics"""
         return {
-            "total_queries": self.stats["total_queries"],
-            "local_queries": self.stats["local_queries"],
-            "global_queries": self.stats["global_queries"],
-            "hybrid_queries": self.stats["hybrid_queries"],
-            "avg_latency_ms": f"{self.stats['avg_latency_ms']:.2f}",
+            "total_queries": self.total_queries,
+            "local_queries": self.query_counts["local"],
+            "global_queries": self.query_counts["global"],
+            "hybrid_queries": self.query_counts["hybrid"],
+            "avg_latency_ms": f"{self.avg_latency_ms:.2f}",
             "timestamp": datetime.now().isoformat()
         }
 
@@ -406,10 +950,7 @@ class HybridRetrievalEngine:
 def test_retrieval_system():
     """Test all three retrieval modes"""
     
-    engine = HybridRetrievalEngine(
-        vector_store_path="./rag_local/hybrid_vectors.json",
-        graph_store_path="./rag_local/hybrid_graph.json"
-    )
+    engine = HybridRetrievalEngine(db_path="./rag_local/hybrid_store.db")
     
     print("\n" + "="*70)
     print("HYBRID DATABASE RETRIEVAL SYSTEM TEST")
@@ -466,7 +1007,7 @@ def test_retrieval_system():
         # 3. HYBRID (VECTOR + GRAPH)
         print("\n3️⃣  HYBRID SEARCH (Vector + Graph Combined) ⭐")
         print("-" * 70)
-        hybrid_result = engine.hybrid_search(query, top_k=5, do_rerank=True)
+        hybrid_result = asyncio.run(engine.ahybrid_search(query, top_k=5, do_rerank=True))
         engine.update_stats("hybrid", hybrid_result.get("latency_ms", 0))
         
         print(f"Mode: {hybrid_result['mode']}")
@@ -11,6 +11,7 @@ from etl_pipeline import (
     UnstructuredETLPipeline,
     Entity,
     Relation,
+    clear_etl_cache,
 )
 
 
@@ -70,6 +71,30 @@ class TestSimpleNERExtractor:
             span_text = text[entity.start_char:entity.end_char]
             assert entity.name in span_text or span_text in entity.name
 
+    def test_overlapping_matches_deduplicated(self):
+        """Test that overlapping matches keep only the most specific type."""
+        text = "Alice works at Acme Corp"
+        entities = self.extractor.extract_entities(text)
+
+        acme = [e for e in entities if 'Acme' in e.name]
+        assert len(acme) == 1, "Acme Corp should be extracted once"
+        assert acme[0].entity_type == 'ORG'
+
+        spans = sorted((e.start_char, e.end_char) for e in entities)
+        for (_, prev_end), (next_start, _) in zip(spans, spans[1:]):
+            assert prev_end <= next_start, "Entity spans should not overlap"
+
+    def test_capitalized_word_before_org_keeps_org(self):
+        """Test that a capitalized word before an org doesn't turn it into a PERSON."""
+        for text in ("The Acme Corp hired Bob.", "Yesterday Acme Corp announced"):
+            entities = self.extractor.extract_entities(text)
+
+            acme = [e for e in entities if 'Acme' in e.name]
+            assert [(e.name, e.entity_type) for e in acme] == [('Acme Corp', 'ORG')]
+
+        entities = self.extractor.extract_entities("The Acme Corp hired Bob.")
+        assert ('Bob', 'PERSON') in [(e.name, e.entity_type) for e in entities]
+
     def test_no_false_positives_on_empty(self):
         """Test that empty text returns no entities."""
         entities = self.extractor.extract_entities("")
@@ -238,6 +263,22 @@ class TestUnstructuredETLPipeline:
         for triple in mention_triples:
             assert triple['obj'] == 'alice_bob_doc'
 
+    @pytest.mark.asyncio
+    async def test_repeated_document_uses_cache(self):
+        """Test that reprocessing the same document returns an equal, independent result."""
+        clear_etl_cache()
+        pipeline = UnstructuredETLPipeline(use_transformer_ner=False)
+        text = "Alice Johnson works at Acme Corp"
+
+        first = await pipeline.process_unstructured_text(text, document_id="cached_doc")
+        first['entities'].clear()
+        second = await pipeline.process_unstructured_text(text, document_id="cached_doc")
+
+        assert len(second['entities']) > 0, "Mutating a result must not affect the cache"
+        other = await pipeline.process_unstructured_text(text, document_id="other_doc")
+        assert other['metadata']['source_document'] == 'other_doc'
+        clear_etl_cache()
+
     @pytest.mark.asyncio
     async def test_metadata_completeness(self):
         """Test that metadata is complete."""
@@ -0,0 +1,256 @@
+"""Unit tests for the SQLite-backed HybridStorageManager.
+
+Run:
+    pytest tests/test_hybrid_storage.py -v
+"""
+
+import json
+import threading
+
+import numpy as np
+import pytest
+
+from hybrid_store import EMBEDDING_DIM, HybridStorageManager
+
+
+@pytest.fixture
+def storage_dir(tmp_path, monkeypatch):
+    """Run each test in its own directory, since the manager uses ./rag_local."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def manager_class(storage_dir):
+    """HybridStorageManager, to be constructed inside the temporary directory."""
+    return HybridStorageManager
+
+
+def _embedding(value):
+    return [value] * EMBEDDING_DIM
+
+
+def _write_json_stores(storage_dir, nodes, edges):
+    rag_local = storage_dir / "rag_local"
+    rag_local.mkdir(exist_ok=True)
+    (rag_local / "hybrid_vectors.json").write_text(json.dumps({"nodes": nodes}))
+    (rag_local / "hybrid_graph.json").write_text(json.dumps({"edges": edges}))
+
+
+class TestJSONImport:
+    """Tests for the one-off import of the pre-SQLite JSON stores."""
+
+    def test_imports_into_empty_database(self, storage_dir, manager_class):
+        """Test nodes and edges of the JSON stores are copied into a new database."""
+        _write_json_stores(
+            storage_dir,
+            {
+                "node-0": {"text": "Alice works at Acme", "embedding": _embedding(0.5),
+                           "metadata": {"source": "a.txt"}, "created_at": "2024-01-01"},
+                "node-1": {"text": "Acme is in Paris", "embedding": _embedding(0.25),
+                           "metadata": {}, "created_at": "2024-01-01"},
+            },
+            [{"id": "edge-0", "source": "node-0", "target": "node-1", "type": "WORKS_AT",
+              "weight": 0.9, "metadata": {}, "created_at": "2024-01-01"}],
+        )
+
+        manager = manager_class()
+
+        assert manager.stats() == {"node_count": 2, "edge_count": 1}
+        node = manager.get_node_from_vector_db("node-0")
+        assert node["text"] == "Alice works at Acme"
+        assert node["metadata"] == {"source": "a.txt"}
+        assert node["embedding_dim"] == EMBEDDING_DIM
+        edge = manager.get_all_edges()[0]
+        assert (edge["source"], edge["target"], edge["type"]) == ("node-0", "node-1", "WORKS_AT")
+
+    def test_skips_import_into_non_empty_database(self, storage_dir, manager_class):
+        """Test the JSON stores are ignored once the database has rows."""
+        manager = manager_class()
+        manager.add_node_to_vector_db("node-0", "Stored in SQLite", _embedding(0.5), {})
+        manager.conn.close()
+
+        _write_json_stores(
+            storage_dir,
+            {"node-9": {"text": "Only in JSON", "embedding": _embedding(0.1),
+                        "metadata": {}, "created_at": "2024-01-01"}},
+            [{"id": "edge-0", "source": "node-9", "target": "node-0", "type": "RELATED_TO",
+              "weight": 1.0, "metadata": {}, "created_at": "2024-01-01"}],
+        )
+
+        reopened = manager_class()
+
+        assert reopened.stats() == {"node_count": 1, "edge_count": 0}
+        assert reopened.get_node_from_vector_db("node-9") is None
+        assert reopened.get_node_from_vector_db("node-0")["text"] == "Stored in SQLite"
+
+
+class TestNodeStorage:
+    """Tests for writing nodes to the table and the in-memory columns."""
+
+    def test_overwrite_updates_columns_and_table(self, storage_dir, manager_class):
+        """Test re-adding a node id replaces its row instead of adding one."""
+        manager = manager_class()
+        manager.add_node_to_vector_db("node-0", "First text", _embedding(1.0), {"version": 1})
+        manager.add_node_to_vector_db("node-1", "Other node", _embedding(1.0), {})
+
+        second = [0.0] * EMBEDDING_DIM
+        second[0] = 2.0
+        manager.add_node_to_vector_db("node-0", "Second text", second, {"version": 2})
+
+        node_ids, texts, matrix = manager.get_soa()
+        assert node_ids == ["node-0", "node-1"]
+        assert texts == ["Second text", "Other node"]
+        np.testing.assert_allclose(matrix[0], np.eye(1, EMBEDDING_DIM)[0])
+        rows, _ = manager.nearest_nodes(second, 1)
+        assert node_ids[rows[0]] == "node-0"
+
+        node = manager.get_node_from_vector_db("node-0")
+        assert node["text"] == "Second text"
+        assert node["metadata"] == {"version": 2}
+        np.testing.assert_array_equal(node["embedding"], np.asarray(second, dtype=np.float32))
+        # The table keeps the overwritten row in place, in the columns' order
+        assert list(manager.get_all_nodes(include_embeddings=False)) == ["node-0", "node-1"]
+
+        reopened_ids, reopened_texts, _ = manager_class().get_soa()
+        assert len(reopened_ids) == 2
+        assert reopened_texts[reopened_ids.index("node-0")] == "Second text"
+
+    def test_other_width_embeddings_are_scored(self, storage_dir, manager_class, monkeypatch):
+        """Test nodes and queries that are not EMBEDDING_DIM wide get the zip()-style cosine."""
+        manager = manager_class()
+        full = np.random.default_rng(0).random(EMBEDDING_DIM)
+        manager.add_node_to_vector_db("full", "Full width", full, {})
+        manager.add_node_to_vector_db("small", "Three dims", [3.0, 4.0, 0.0], {})
+
+        query = np.random.default_rng(1).random(EMBEDDING_DIM)
+        expected_small = np.dot(query[:3], [3.0, 4.0, 0.0]) / (np.linalg.norm(query) * 5.0)
+        scores = manager.cosine_similarities(query)
+        assert scores[1] == pytest.approx(expected_small, rel=1e-5)
+        # Full-width rows may be scored on int8 codes (EMBEDDING_QUANTIZATION)
+        assert scores[0] == pytest.approx(
+            np.dot(query, full) / (np.linalg.norm(query) * np.linalg.norm(full)), abs=2e-3
+        )
+
+        # A short query is compared over its own width
+        short_scores = manager.cosine_similarities([1.0, 0.0])
+        assert short_scores[0] == pytest.approx(full[0] / np.linalg.norm(full), rel=1e-5)
+        assert short_scores[1] == pytest.approx(0.6, rel=1e-5)
+
+        # The rows survive a reopen, and reach the ANN path's results too
+        reopened = manager_class()
+        np.testing.assert_allclose(reopened.cosine_similarities(query), scores, rtol=1e-5)
+        pytest.importorskip("faiss")
+        monkeypatch.setattr("hybrid_store.ANN_MIN_NODES", 1)
+        rows, ann_scores = reopened.nearest_nodes(query, 2)
+        assert sorted(rows.tolist()) == [0, 1]
+        assert ann_scores[rows.tolist().index(1)] == pytest.approx(expected_small, rel=1e-5)
+
+
+class TestEdgeStorage:
+    """Tests for edge ids and graph traversal."""
+
+    def test_edge_ids_follow_max_seq(self, storage_dir, manager_class):
+        """Test edge ids count up from the table and carry on after a reopen."""
+        manager = manager_class()
+        first = manager.add_edge_to_graph_db("a", "b", "RELATED_TO", 1.0, {})
+        second = manager.add_edge_to_graph_db("b", "c", "RELATED_TO", 1.0, {})
+        assert (first["id"], second["id"]) == ("edge-0", "edge-1")
+
+        reopened = manager_class()
+        third = reopened.add_edge_to_graph_db("c", "a", "RELATED_TO", 1.0, {})
+        assert third["id"] == "edge-2"
+        assert [edge["id"] for edge in reopened.get_all_edges()] == ["edge-0", "edge-1", "edge-2"]
+
+    def test_neighbors_respect_depth(self, storage_dir, manager_class):
+        """Test traversal stops after `depth` further hops past the direct neighbors."""
+        manager = manager_class()
+        for node_id in ("a", "b", "c", "d"):
+            manager.add_node_to_vector_db(node_id, f"Node {node_id}", _embedding(1.0), {})
+        manager.add_edge_to_graph_db("a", "b", "NEXT", 1.0, {})
+        manager.add_edge_to_graph_db("b", "c", "NEXT", 1.0, {})
+        manager.add_edge_to_graph_db("c", "d", "NEXT", 1.0, {})
+
+        direct = manager.get_neighbors_from_graph("a", depth=0)
+        assert list(direct) == ["b"]
+        assert direct["b"]["depth"] == 0
+        assert direct["b"]["text"] == "Node b"
+
+        two_hops = manager.get_neighbors_from_graph("a", depth=1)
+        assert {node_id: n["depth"] for node_id, n in two_hops.items()} == {"b": 0, "c": 1}
+
+    def test_neighbors_with_dangling_target(self, storage_dir, manager_class):
+        """Test an edge to an id with no stored node yields a neighbor without text."""
+        manager = manager_class()
+        manager.add_node_to_vector_db("a", "Node a", _embedding(1.0), {})
+        manager.add_edge_to_graph_db("a", "missing", "RELATED_TO", 0.5, {})
+        manager.add_edge_to_graph_db("missing", "a", "RELATED_TO", 0.5, {})
+
+        neighbors = manager.get_neighbors_from_graph("a", depth=2)
+
+        assert neighbors["missing"]["text"] is None
+        assert [edge["id"] for edge in neighbors["missing"]["edges"]] == ["edge-0"]
+        # The edge back to the start node is recorded but not followed again
+        assert neighbors["a"]["text"] == "Node a"
+        assert neighbors["a"]["depth"] == 1
+
+
+class TestConcurrentWrites:
+    """Tests for writes from several threads, as file uploads make them."""
+
+    def test_uploads_in_threads_keep_table_and_columns_in_step(self, storage_dir, manager_class):
+        """Test concurrent file processing and single inserts lose and mix up no rows."""
+        manager = manager_class()
+        paths = []
+        for n in range(3):
+            path = storage_dir / f"upload-{n}.txt"
+            path.write_text("\n".join(f"File {n} has line number {i}" for i in range(200)))
+            paths.append(str(path))
+
+        threads = [
+            threading.Thread(target=manager.process_text_file, args=(path, f"upload-{n}.txt"))
+            for n, path in enumerate(paths)
+        ]
+        for thread in threads:
+            thread.start()
+        for i in range(50):
+            (node_id,) = manager.new_node_ids()
+            manager.add_node_to_vector_db(node_id, f"Single node {i}", _embedding(1.0), {})
+        for thread in threads:
+            thread.join()
+
+        node_ids, texts, _ = manager.get_soa()
+        assert manager.stats()["node_count"] == 650
+        assert len(set(node_ids)) == 650
+        stored = manager.get_all_nodes(include_embeddings=False)
+        assert list(stored) == node_ids
+        assert [node["text"] for node in stored.values()] == texts
+
+    def test_ann_searches_in_threads_during_writes(self, storage_dir, manager_class, monkeypatch):
+        """Test concurrent searches share one lazily built HNSW index while nodes are added."""
+        pytest.importorskip("faiss")
+        monkeypatch.setattr("hybrid_store.ANN_MIN_NODES", 1)
+        manager = manager_class()
+        embeddings = np.random.default_rng(0).random((3000, EMBEDDING_DIM), dtype=np.float32)
+        manager.bulk_add_nodes([(f"node-{i}", f"Node {i}", embeddings[i], {}) for i in range(2000)])
+
+        found = []
+
+        def search():
+            for _ in range(30):
+                rows, _ = manager.nearest_nodes(embeddings[0], 5)
+                found.append(rows.tolist())
+
+        threads = [threading.Thread(target=search) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for i in range(2000, 3000):
+            manager.add_node_to_vector_db(f"node-{i}", f"Node {i}", embeddings[i], {})
+        for thread in threads:
+            thread.join()
+
+        assert len(found) == 240
+        assert all(len(set(rows)) == len(rows) and max(rows) < 3000 for rows in found)
+        # Every row was added to the index exactly once
+        manager.nearest_nodes(embeddings[0], 5)
+        assert manager._ann_index.ntotal == 3000
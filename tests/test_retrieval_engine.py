@@ -0,0 +1,165 @@
+"""Unit tests for retrieval_engine.py over the SQLite store.
+
+Run:
+    pytest tests/test_retrieval_engine.py -v
+"""
+
+import asyncio
+import copy
+
+import numpy as np
+import pytest
+
+from hybrid_store import EMBEDDING_DIM, HybridStorageManager
+from retrieval_engine import HybridRetrievalEngine
+
+
+DEMO_TEXTS = [
+    "Elon Musk founded SpaceX in 2002",
+    "SpaceX is located in Hawthorne, California",
+    "Tesla manufactures electric vehicles",
+]
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """A storage manager with three nodes and two edges, under tmp_path/rag_local."""
+    monkeypatch.chdir(tmp_path)
+    manager = HybridStorageManager()
+    rng = np.random.default_rng(0)
+    for i, text in enumerate(DEMO_TEXTS):
+        manager.add_node_to_vector_db(
+            f"node-{i}", text, rng.random(EMBEDDING_DIM, dtype=np.float32), {"index": i}
+        )
+    manager.add_edge_to_graph_db("node-0", "node-1", "LOCATED_IN", 1.0, {})
+    manager.add_edge_to_graph_db("node-0", "node-2", "RELATED_TO", 0.5, {})
+    return manager
+
+
+class TestSQLiteStore:
+    """Tests for reading the engine's columns and graph from hybrid_store.db."""
+
+    def test_default_path_reads_manager_store(self, manager):
+        """Test the default db_path is the database the storage manager writes."""
+        engine = HybridRetrievalEngine()
+
+        result = engine.local_search("SpaceX", top_k=3)
+
+        assert "error" not in result
+        assert result["total_found"] == 3
+        by_id = {r["node_id"]: r for r in result["results"]}
+        assert set(by_id) == {"node-0", "node-1", "node-2"}
+        assert by_id["node-1"]["text"] == DEMO_TEXTS[1]
+        assert by_id["node-1"]["metadata"] == {"index": 1}
+
+    def test_similarity_matches_stored_embeddings(self, manager):
+        """Test scores are cosine similarities against the stored float32 vectors."""
+        engine = HybridRetrievalEngine(db_path=manager.db_path)
+        query = "Tesla"
+
+        result = engine.local_search(query, top_k=1)
+
+        query_vector = engine._embed_query(query)
+        stored = {
+            node_id: manager.get_node_from_vector_db(node_id)["embedding"]
+            for node_id in ("node-0", "node-1", "node-2")
+        }
+        expected = {
+            node_id: float(np.dot(v, query_vector) / (np.linalg.norm(v) * np.linalg.norm(query_vector)))
+            for node_id, v in stored.items()
+        }
+        best = max(expected, key=expected.get)
+        assert result["results"][0]["node_id"] == best
+        assert result["results"][0]["similarity_score"] == pytest.approx(expected[best], rel=1e-5)
+
+    def test_global_search_uses_stored_edges(self, manager):
+        """Test relationships come from the edges table."""
+        engine = HybridRetrievalEngine(db_path=manager.db_path)
+
+        result = engine.global_search("Musk", depth=1)
+
+        assert "error" not in result
+        assert {"source": "node-0", "target": "node-1", "type": "LOCATED_IN", "weight": 1.0} in result["relationships"]
+        assert {e["node_id"] for e in result["entities"]} >= {"node-0", "node-1", "node-2"}
+
+    def test_missing_database_is_an_error(self, tmp_path):
+        """Test a missing store is reported, not created empty."""
+        db_path = tmp_path / "missing.db"
+        engine = HybridRetrievalEngine(db_path=str(db_path))
+
+        result = engine.local_search("SpaceX")
+
+        assert "error" in result
+        assert result["results"] == []
+        assert not db_path.exists()
+
+
+def _without_latency(result):
+    return {key: value for key, value in result.items() if key != "latency_ms"}
+
+
+class TestResultCache:
+    """Tests for caching results between writes to the store."""
+
+    def test_write_through_store_invalidates_cache(self, manager):
+        """Test a node written after a cached search shows up in the next one."""
+        engine = HybridRetrievalEngine(db_path=manager.db_path)
+        assert engine.local_search("SpaceX", top_k=5)["total_found"] == 3
+
+        manager.add_node_to_vector_db(
+            "node-3", "SpaceX launches Falcon 9", np.ones(EMBEDDING_DIM, dtype=np.float32), {}
+        )
+
+        result = engine.local_search("SpaceX", top_k=5)
+        assert result["total_found"] == 4
+        assert "node-3" in {r["node_id"] for r in result["results"]}
+
+    def test_result_of_replaced_snapshot_is_not_cached(self, manager, monkeypatch):
+        """Test a search whose store is reloaded part-way through doesn't cache its stale result."""
+        engine = HybridRetrievalEngine(db_path=manager.db_path)
+        similarities = engine._corpus_similarities
+
+        def write_during_search(query_embedding, store):
+            # Another caller writes and reloads while this search is running
+            manager.add_node_to_vector_db(
+                "node-3", "SpaceX launches Falcon 9", np.ones(EMBEDDING_DIM, dtype=np.float32), {}
+            )
+            engine._load_store()
+            return similarities(query_embedding, store)
+
+        monkeypatch.setattr(engine, "_corpus_similarities", write_during_search)
+        assert engine.local_search("SpaceX", top_k=5)["total_found"] == 3
+        monkeypatch.setattr(engine, "_corpus_similarities", similarities)
+
+        assert engine.local_search("SpaceX", top_k=5)["total_found"] == 4
+
+    def test_callers_get_copies(self, manager):
+        """Test mutating a returned result changes neither the cache nor the store."""
+        engine = HybridRetrievalEngine(db_path=manager.db_path)
+
+        first = engine.local_search("SpaceX", top_k=3)
+        expected = _without_latency(copy.deepcopy(first))
+        first["results"][0]["metadata"]["index"] = -1
+        first["results"].clear()
+
+        second = engine.local_search("SpaceX", top_k=3)
+        assert _without_latency(second) == expected
+        second["results"][0]["metadata"]["index"] = -1
+
+        assert _without_latency(engine.local_search("SpaceX", top_k=3)) == expected
+        assert engine._store.metadatas == [{"index": i} for i in range(3)]
+
+    @pytest.mark.parametrize("do_rerank", [False, True])
+    def test_async_hybrid_matches_sync(self, manager, do_rerank):
+        """Test ahybrid_search returns what hybrid_search does, cached or not."""
+        sync_engine = HybridRetrievalEngine(db_path=manager.db_path)
+        async_engine = HybridRetrievalEngine(db_path=manager.db_path)
+
+        expected = sync_engine.hybrid_search("SpaceX Musk", top_k=3, do_rerank=do_rerank)
+        assert "error" not in expected
+
+        for _ in range(2):
+            result = asyncio.run(
+                async_engine.ahybrid_search("SpaceX Musk", top_k=3, do_rerank=do_rerank)
+            )
+            assert _without_latency(result) == _without_latency(expected)